@@ -0,0 +1,61 @@
+"""
+Shared setup for the offline tests (everything except test_api.py).
+
+main.py opens its stores at import time, so point it at a throwaway
+directory before any test module imports it.
+"""
+
+import os
+import re
+import zlib
+import tempfile
+
+import numpy as np
+import pytest
+
+_test_store = tempfile.mkdtemp(prefix="nestwell-test-")
+os.environ.pop("CHROMA_HOST", None)
+os.environ["CHROMA_PATH"] = _test_store
+os.environ["INGEST_INDEX_PATH"] = os.path.join(_test_store, "ingest_index.sqlite")
+
+EMBEDDING_DIM = 8
+
+class HashingEmbeddings:
+    """Deterministic bag-of-words embeddings, so tests never load the ONNX model"""
+    def __call__(self, input):
+        vectors = []
+        for text in input:
+            vector = np.full(EMBEDDING_DIM, 1e-3, dtype=np.float32)
+            for word in re.findall(r"\w+", text.lower()):
+                vector[zlib.crc32(word.encode("utf-8")) % EMBEDDING_DIM] += 1
+            vectors.append(vector)
+        return vectors
+
+@pytest.fixture
+def store():
+    """main.py with empty papers and abstracts collections and no negative cache"""
+    import main
+    main.refresh_collections()
+    main.empty_papers_collections()
+    main.clear_abstracts()
+    main.clear_negative_cache()
+    return main
+
+@pytest.fixture
+def add_stored_papers(store):
+    """Write papers straight to the store with HashingEmbeddings vectors, bypassing dedup"""
+    def add(papers):
+        store.store_abstracts({p['pmid']: p['abstract'] for p in papers})
+        store.write_papers(
+            ids=[store.paper_id(p['pmid']) for p in papers],
+            metadatas=[store.build_paper_metadata(p, category=p.get('category')) for p in papers],
+            embeddings=[list(map(float, vector)) for vector in HashingEmbeddings()(
+                [store.embedding_text(p['title'], p['abstract']) for p in papers]
+            )]
+        )
+    return add
+
+@pytest.fixture
+def embeddings(store, monkeypatch):
+    """Embed papers and queries with HashingEmbeddings"""
+    monkeypatch.setattr(store, "embedding_function", HashingEmbeddings())
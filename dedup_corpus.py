@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Remove near-duplicate papers from the existing corpus.
+
+Ingestion already skips near-duplicates, but papers stored before that (or
+loaded through overlapping preload topics) may still contain errata and
+republished abstracts. This script compares every stored abstract with
+MinHash/LSH, keeps the best-scored paper of each group and deletes its
+near-duplicates. It also rebuilds the near-duplicate index used at
+ingestion time, which is local to the writer's host (INGEST_INDEX_PATH), so
+run it there.
+
+With the embedded store (no CHROMA_HOST), stop the server first: the store
+is single-process. Against a Chroma server (CHROMA_HOST set) it can run
+while the server is up; readers pick up the change via the corpus version.
+
+Usage:
+    python dedup_corpus.py [--dry-run]
+"""
+
+import os
+import sys
+import argparse
+from collections import defaultdict
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+# Import from main.py
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from main import (
+    NEAR_DUPLICATE_THRESHOLD,
+    minhash_signature,
+    signature_similarity,
+    lsh_bucket_keys,
+    read_all_papers,
+    fetch_abstracts,
+    store_abstracts,
+    remove_papers,
+    bump_corpus_version
+)
+
+def find_clusters(signatures, ranked):
+    """Group near-duplicates around the paper each group keeps.
+
+    Papers are visited best first (`ranked`). A paper not yet in a cluster
+    is kept and claims every unclaimed paper that is a near-duplicate of it,
+    the same pairwise test ingestion applies, so papers are never chained
+    together through intermediate versions. Returns [kept, *dropped] lists.
+    """
+    buckets = defaultdict(list)
+    for pmid, signature in signatures.items():
+        for key in lsh_bucket_keys(signature):
+            buckets[key].append(pmid)
+
+    rank = {pmid: i for i, pmid in enumerate(ranked)}
+    claimed = set()
+    clusters = []
+    for keep in ranked:
+        if keep in claimed or keep not in signatures:
+            continue
+        claimed.add(keep)
+        candidates = {pmid for key in lsh_bucket_keys(signatures[keep]) for pmid in buckets[key]} - claimed
+        drop = sorted(
+            (pmid for pmid in candidates
+             if signature_similarity(signatures[keep], signatures[pmid]) >= NEAR_DUPLICATE_THRESHOLD),
+            key=rank.get
+        )
+        if drop:
+            claimed.update(drop)
+            clusters.append([keep] + drop)
+    return clusters
+
+def main_cli():
+    """Deduplicate the stored corpus."""
+    parser = argparse.ArgumentParser(description="Remove near-duplicate papers from the corpus")
+    parser.add_argument("--dry-run", action="store_true", help="Only report clusters, delete nothing")
+    args = parser.parse_args()
+
+    print("\n" + "="*60)
+    print("NEAR-DUPLICATE CLEANUP")
+    print(f"Similarity threshold: {NEAR_DUPLICATE_THRESHOLD}")
+    print("="*60)
+
+    metadatas = read_all_papers(["metadatas"])['metadatas']
+    by_pmid = {m['pmid']: m for m in metadatas}
+    abstracts = fetch_abstracts(list(by_pmid))
+    signatures = {}
+    for pmid, text in abstracts.items():
+        signature = minhash_signature(text)
+        if signature is not None:
+            signatures[pmid] = signature
+
+    # Best quality first; newer paper breaks ties
+    ranked = sorted(by_pmid, key=lambda pmid: (by_pmid[pmid]['quality_score'], by_pmid[pmid].get('year', '')), reverse=True)
+    clusters = find_clusters(signatures, ranked)
+    to_remove = []
+    for keep, *drop in clusters:
+        to_remove.extend(drop)
+        print(f"Keeping {keep} ({by_pmid[keep]['quality_score']}/100), dropping {', '.join(drop)}")
+
+    print(f"\nPapers scanned: {len(by_pmid)}")
+    print(f"Near-duplicate clusters: {len(clusters)}")
+    print(f"Papers to remove: {len(to_remove)}")
+
+    if args.dry_run:
+        print("\nDry run - nothing deleted")
+        return
+
+    remove_papers(to_remove)
+
+    # Rebuild the ingestion-time index for what is left
+    removed = set(to_remove)
+    store_abstracts({pmid: text for pmid, text in abstracts.items() if pmid not in removed})
+
+    if to_remove:
+        print(f"Corpus version: {bump_corpus_version()}")
+    print("\n✅ Cleanup complete!")
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Compare HNSW settings on the stored corpus: recall@k against exact search
+and query latency for each setting.
+
+Every setting gets a throwaway in-memory index built from the stored
+embeddings, so the live collections are never touched. Queries are a
+random sample of stored papers (each query ignores its own paper).
+
+A second table compares one index with category partitions
+(COLLECTION_PARTITIONING=category) for each life stage: recall@k of the
+routed partitions alone and with the fallback to the other partitions that
+/assess uses when the routed ones return fewer than k papers.
+
+Usage:
+    python hnsw_report.py [--k 5] [--queries 100]
+        [--m 8 16 32] [--construction-ef 100 200] [--search-ef 10 50 100]
+"""
+
+import os
+import sys
+import time
+import argparse
+import itertools
+
+import numpy as np
+import chromadb
+from chromadb.config import Settings
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+# Import from main.py
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from main import (
+    HNSW_SETTINGS,
+    COLLECTION_PARTITIONING,
+    PARTITION_CATEGORIES,
+    LIFE_STAGE_CATEGORIES,
+    paper_partition_category,
+    routed_categories,
+    read_all_papers
+)
+
+def exact_neighbours(matrix, query_rows, k):
+    """Exact cosine top-k for each query row, excluding the row itself."""
+    normed = matrix / np.linalg.norm(matrix, axis=1, keepdims=True)
+    scores = normed[query_rows] @ normed.T
+    scores[np.arange(len(query_rows)), query_rows] = -np.inf
+    return np.argsort(-scores, axis=1)[:, :k]
+
+def add_embeddings(client, index, ids, matrix):
+    """Add embeddings to an index in batches."""
+    batch_size = client.get_max_batch_size()
+    for start in range(0, len(ids), batch_size):
+        index.add(ids=ids[start:start + batch_size], embeddings=matrix[start:start + batch_size])
+
+def evaluate(client, ids, matrix, query_rows, truth, k, m, construction_ef, search_ef):
+    """Build an index with one setting and measure recall@k and latency."""
+    name = f"hnsw_report_{m}_{construction_ef}_{search_ef}"
+    index = client.create_collection(
+        name=name,
+        metadata={
+            "hnsw:space": "cosine",
+            "hnsw:M": m,
+            "hnsw:construction_ef": construction_ef,
+            "hnsw:search_ef": search_ef
+        },
+        embedding_function=None
+    )
+    try:
+        build_start = time.perf_counter()
+        add_embeddings(client, index, ids, matrix)
+        build_seconds = time.perf_counter() - build_start
+
+        position = {paper: i for i, paper in enumerate(ids)}
+        hits = 0
+        latencies = []
+        for row, expected in zip(query_rows, truth):
+            query_start = time.perf_counter()
+            result = index.query(query_embeddings=[matrix[row]], n_results=k + 1, include=[])
+            latencies.append((time.perf_counter() - query_start) * 1000)
+            found = [position[paper] for paper in result['ids'][0] if position[paper] != row][:k]
+            hits += len(set(found) & set(expected.tolist()))
+    finally:
+        client.delete_collection(name=name)
+
+    return {
+        "recall": hits / (len(query_rows) * k),
+        "p50_ms": float(np.percentile(latencies, 50)),
+        "p95_ms": float(np.percentile(latencies, 95)),
+        "build_s": build_seconds
+    }
+
+def evaluate_routing(client, ids, matrix, categories, query_rows, truth, k):
+    """Recall@k and latency of life-stage routing against one index.
+
+    Uses the current HNSW settings for every index. For each life stage the
+    sampled queries run against the single index, the routed partitions,
+    and the routed partitions plus the fallback.
+    """
+    position = {paper: i for i, paper in enumerate(ids)}
+    indexes = {}
+    try:
+        for key in ["all"] + PARTITION_CATEGORIES:
+            rows = [i for i in range(len(ids)) if key == "all" or categories[i] == key]
+            indexes[key] = client.create_collection(
+                name=f"hnsw_report_partition_{key}",
+                metadata=dict(HNSW_SETTINGS),
+                embedding_function=None
+            )
+            if rows:
+                add_embeddings(client, indexes[key], [ids[i] for i in rows], matrix[rows])
+
+        def search(keys, row):
+            found = []
+            for key in keys:
+                count = indexes[key].count()
+                if not count:
+                    continue
+                result = indexes[key].query(query_embeddings=[matrix[row]], n_results=min(k + 1, count), include=["distances"])
+                found.extend((distance, position[paper]) for distance, paper in zip(result['distances'][0], result['ids'][0])
+                             if position[paper] != row)
+            found.sort()
+            return [found_row for _, found_row in found[:k]]
+
+        report = []
+        for life_stage in LIFE_STAGE_CATEGORIES:
+            routed = routed_categories(life_stage)
+            others = [key for key in PARTITION_CATEGORIES if key not in routed]
+            hits = {"single": 0, "routed": 0, "fallback": 0}
+            latencies = {"single": [], "routed": [], "fallback": []}
+            fallbacks = 0
+            for row, expected in zip(query_rows, truth):
+                expected = set(expected.tolist())
+
+                query_start = time.perf_counter()
+                single = search(["all"], row)
+                latencies["single"].append((time.perf_counter() - query_start) * 1000)
+
+                query_start = time.perf_counter()
+                routed_found = search(routed, row)
+                latencies["routed"].append((time.perf_counter() - query_start) * 1000)
+                with_fallback = routed_found
+                if len(routed_found) < k and others:
+                    fallbacks += 1
+                    with_fallback = routed_found + search(others, row)[:k - len(routed_found)]
+                latencies["fallback"].append((time.perf_counter() - query_start) * 1000)
+
+                hits["single"] += len(set(single) & expected)
+                hits["routed"] += len(set(routed_found) & expected)
+                hits["fallback"] += len(set(with_fallback) & expected)
+
+            total = len(query_rows) * k
+            report.append({
+                "life_stage": life_stage,
+                "partitions": routed,
+                "fallbacks": fallbacks,
+                **{f"recall_{mode}": hits[mode] / total for mode in hits},
+                **{f"p50_{mode}_ms": float(np.percentile(latencies[mode], 50)) for mode in latencies}
+            })
+    finally:
+        for index in indexes.values():
+            client.delete_collection(name=index.name)
+
+    return report
+
+def main_cli():
+    """Run the report."""
+    parser = argparse.ArgumentParser(description="Recall/latency report for HNSW settings")
+    parser.add_argument("--k", type=int, default=5, help="Neighbours per query (default matches max_papers)")
+    parser.add_argument("--queries", type=int, default=100, help="Number of sampled queries")
+    parser.add_argument("--m", type=int, nargs="+", default=[8, 16, 32])
+    parser.add_argument("--construction-ef", type=int, nargs="+", default=[100, 200])
+    parser.add_argument("--search-ef", type=int, nargs="+", default=[10, 50, 100])
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    papers = read_all_papers(["embeddings", "metadatas"])
+    ids = papers['ids']
+    if len(ids) <= args.k:
+        print(f"Need more than {args.k} stored papers for a report, found {len(ids)}")
+        return
+    matrix = np.asarray(papers['embeddings'], dtype=np.float32)
+
+    rng = np.random.default_rng(args.seed)
+    query_rows = rng.choice(len(ids), size=min(args.queries, len(ids)), replace=False)
+    truth = exact_neighbours(matrix, query_rows, args.k)
+
+    print("\n" + "="*60)
+    print("HNSW RECALL / LATENCY REPORT")
+    print(f"Papers: {len(ids)}  Queries: {len(query_rows)}  k: {args.k}")
+    print(f"Partitioning: {COLLECTION_PARTITIONING}  Current settings: {HNSW_SETTINGS}")
+    print("="*60)
+    print(f"{'M':>4} {'constr_ef':>10} {'search_ef':>10} {'recall@k':>9} {'p50 ms':>8} {'p95 ms':>8} {'build s':>8}")
+
+    client = chromadb.EphemeralClient(settings=Settings(anonymized_telemetry=False))
+    for m, construction_ef, search_ef in itertools.product(args.m, args.construction_ef, args.search_ef):
+        row = evaluate(client, ids, matrix, query_rows, truth, args.k, m, construction_ef, search_ef)
+        print(f"{m:>4} {construction_ef:>10} {search_ef:>10} {row['recall']:>9.3f} "
+              f"{row['p50_ms']:>8.2f} {row['p95_ms']:>8.2f} {row['build_s']:>8.2f}")
+
+    categories = [paper_partition_category(metadata) for metadata in papers['metadatas']]
+    sizes = {category: categories.count(category) for category in PARTITION_CATEGORIES}
+    print("\n" + "="*60)
+    print("PARTITIONED VS SINGLE INDEX (current settings)")
+    print("Partition sizes: " + "  ".join(f"{category}={size}" for category, size in sizes.items()))
+    print("="*60)
+    print(f"{'life_stage':<11} {'partitions':<22} {'single':>7} {'routed':>7} {'+fallbk':>7} "
+          f"{'fallbk%':>7} {'p50 single':>10} {'p50 routed':>10} {'p50 +fb':>8}")
+    for row in evaluate_routing(client, ids, matrix, categories, query_rows, truth, args.k):
+        partitions = "all" if len(row['partitions']) == len(PARTITION_CATEGORIES) else ",".join(row['partitions'])
+        print(f"{row['life_stage']:<11} {partitions:<22} {row['recall_single']:>7.3f} "
+              f"{row['recall_routed']:>7.3f} {row['recall_fallback']:>7.3f} "
+              f"{100 * row['fallbacks'] / len(query_rows):>6.0f}% {row['p50_single_ms']:>10.2f} "
+              f"{row['p50_routed_ms']:>10.2f} {row['p50_fallback_ms']:>8.2f}")
+    print("\nRecall is against exact search over the whole corpus. Low routed recall")
+    print("means the relevant papers are stored under other categories.")
+
+    print("\nHNSW_SEARCH_EF takes effect when the server restarts. For HNSW_M or")
+    print("HNSW_CONSTRUCTION_EF, run migrate_storage.py to rebuild the collections.")
+
+if __name__ == "__main__":
+    main_cli()
@@ -1,15 +1,29 @@
 import os
+import io
+import base64
+import sys
+import random
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 import xml.etree.ElementTree as ET
 from dotenv import load_dotenv
 import time
+import re
+import sqlite3
+import threading
+import uuid
+import zlib
+import numpy as np
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from pydantic import BaseModel, Field
 import chromadb
 from chromadb.config import Settings
+from chromadb.utils import embedding_functions
+import requests
+from requests.adapters import HTTPAdapter
 from Bio import Entrez
 
 # Load environment variables
@@ -24,7 +38,10 @@ except Exception:
     GEMINI_AVAILABLE = False
     print("Google Gemini not available - will use basic assessment mode")
 
-Entrez.email = os.getenv("NCBI_EMAIL", "user@example.com")
+# NCBI E-utilities
+NCBI_EMAIL = os.getenv("NCBI_EMAIL", "user@example.com")
+NCBI_API_KEY = os.getenv("NCBI_API_KEY")
+EUTILS_BASE_URL = os.getenv("EUTILS_BASE_URL", "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/")
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -40,27 +57,205 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag"],
 )
 
+# Compress larger responses (/papers, /assess) for clients that accept gzip
+app.add_middleware(GZipMiddleware, minimum_size=1000)
+
+# Serving mode
+# - writer: owns ingestion (/load-papers, DELETE /papers)
+# - reader: query-only worker, ingestion endpoints are rejected
+SERVER_ROLE = os.getenv("SERVER_ROLE", "writer").lower()
+if SERVER_ROLE not in ("writer", "reader"):
+    raise ValueError(f"SERVER_ROLE must be 'writer' or 'reader', got '{SERVER_ROLE}'")
+
 # Initialize ChromaDB
-chroma_client = chromadb.PersistentClient(
-    path="./chroma_db",
-    settings=Settings(anonymized_telemetry=False)
+# With CHROMA_HOST set, every worker talks to one shared Chroma server over a
+# keep-alive HTTP client, so several uvicorn workers can serve /assess in
+# parallel. Without it we embed the on-disk store, which is only safe for a
+# single process.
+CHROMA_HOST = os.getenv("CHROMA_HOST")
+CHROMA_PATH = os.getenv("CHROMA_PATH", "./chroma_db")
+if CHROMA_HOST:
+    chroma_client = chromadb.HttpClient(
+        host=CHROMA_HOST,
+        port=int(os.getenv("CHROMA_PORT", 8001)),
+        settings=Settings(anonymized_telemetry=False)
+    )
+else:
+    chroma_client = chromadb.PersistentClient(
+        path=CHROMA_PATH,
+        settings=Settings(anonymized_telemetry=False)
+    )
+
+# Embeddings are computed by us from title + abstract and stored without a
+# Chroma document; the abstract itself lives once in the abstracts collection.
+# Queries still use this function to embed the query text.
+COLLECTION_NAME = "toxicity_papers"
+embedding_function = embedding_functions.DefaultEmbeddingFunction()
+
+# HNSW index parameters; use hnsw_report.py to compare settings. They are
+# passed as metadata when a collection is created. Chroma ignores them for
+# existing collections, so search_ef is applied to the live configuration
+# when collections are opened; M and construction_ef are fixed at build time
+# and only change when migrate_storage.py rebuilds the collections.
+# (metadata key, env var, key in the collection's hnsw configuration)
+HNSW_PARAMETERS = (
+    ("hnsw:M", "HNSW_M", "max_neighbors"),
+    ("hnsw:construction_ef", "HNSW_CONSTRUCTION_EF", "ef_construction"),
+    ("hnsw:search_ef", "HNSW_SEARCH_EF", "ef_search")
 )
+HNSW_SETTINGS: Dict[str, Any] = {"hnsw:space": "cosine"}
+for _key, _env, _ in HNSW_PARAMETERS:
+    if os.getenv(_env):
+        HNSW_SETTINGS[_key] = int(os.getenv(_env))
 
-# Get or create collection
-try:
-    collection = chroma_client.get_collection(name="toxicity_papers")
-except:
-    collection = chroma_client.create_collection(
-        name="toxicity_papers",
-        metadata={"hnsw:space": "cosine"}
-    )
+# Partitioning
+# - none: every paper in one collection
+# - category: one collection per life-stage category; /assess only queries
+#   the partitions relevant to the request's life stage
+COLLECTION_PARTITIONING = os.getenv("COLLECTION_PARTITIONING", "none").lower()
+if COLLECTION_PARTITIONING not in ("none", "category"):
+    raise ValueError(f"COLLECTION_PARTITIONING must be 'none' or 'category', got '{COLLECTION_PARTITIONING}'")
+PARTITION_CATEGORIES = ["pregnancy", "planning", "postpartum", "general"]
+LIFE_STAGE_CATEGORIES = {
+    "pregnant": "pregnancy",
+    "planning": "planning",
+    "postpartum": "postpartum",
+    "general": "general"
+}
+
+def partition_names() -> Dict[str, str]:
+    """Partition key -> collection name for the current mode"""
+    if COLLECTION_PARTITIONING == "category":
+        return {category: f"{COLLECTION_NAME}_{category}" for category in PARTITION_CATEGORIES}
+    return {"all": COLLECTION_NAME}
+
+def apply_hnsw_settings(papers_collection: Any):
+    """Bring an existing collection's search_ef in line with HNSW_SETTINGS and
+    warn about build-time parameters that differ"""
+    live = (papers_collection.configuration or {}).get("hnsw") or {}
+    if not live:
+        return
+    for key, env, live_key in HNSW_PARAMETERS:
+        wanted = HNSW_SETTINGS.get(key)
+        if wanted is None or live.get(live_key) == wanted:
+            continue
+        if live_key == "ef_search":
+            papers_collection.modify(configuration={"hnsw": {"ef_search": wanted}})
+        else:
+            print(f"Warning: {papers_collection.name} was built with {live_key}={live.get(live_key)}, "
+                  f"{env}={wanted} only applies to new collections - run migrate_storage.py to rebuild")
+
+def open_papers_collections(reset: bool = False) -> Dict[str, Any]:
+    """Get or create the papers collections, optionally clearing them first"""
+    opened = {}
+    for key, name in partition_names().items():
+        if reset:
+            chroma_client.delete_collection(name=name)
+        opened[key] = chroma_client.get_or_create_collection(
+            name=name,
+            metadata=dict(HNSW_SETTINGS),
+            embedding_function=embedding_function
+        )
+        apply_hnsw_settings(opened[key])
+    return opened
+
+def paper_partition_category(metadata: Dict[str, Any]) -> str:
+    """Category partition a paper belongs to under category partitioning"""
+    category = metadata.get("category")
+    return category if category in PARTITION_CATEGORIES else "general"
+
+def partition_key(metadata: Dict[str, Any]) -> str:
+    """Partition a paper belongs to"""
+    if COLLECTION_PARTITIONING != "category":
+        return "all"
+    return paper_partition_category(metadata)
+
+def routed_categories(life_stage: Optional[str]) -> List[str]:
+    """Category partitions a life stage is routed to under category partitioning"""
+    category = LIFE_STAGE_CATEGORIES.get((life_stage or "").lower())
+    if category is None or category == "general":
+        return list(PARTITION_CATEGORIES)
+    return [category, "general"]
+
+def partitions_for_life_stage(life_stage: Optional[str]) -> List[str]:
+    """Partitions /assess should search first for a life stage"""
+    if COLLECTION_PARTITIONING != "category":
+        return ["all"]
+    return routed_categories(life_stage)
+
+# Get or create collections
+collections = open_papers_collections()
+
+# Abstracts collection: full abstracts, zlib-compressed, keyed by PMID. Only
+# read when building the assessment prompt. It lives in Chroma next to the
+# papers, so every worker reaches it through the same client.
+abstracts_collection = chroma_client.get_or_create_collection(name="paper_abstracts")
+
+# Ingest index: the writer's local SQLite file with the near-duplicate index
+# and the read-through negative cache. Only the writer and the maintenance
+# scripts use it; keep it on local disk (WAL does not work on network shares).
+INGEST_INDEX_PATH = os.getenv("INGEST_INDEX_PATH", os.path.join(CHROMA_PATH, "ingest_index.sqlite"))
+
+# Near-duplicate detection: MinHash signatures over word 3-shingles of each
+# abstract, indexed with LSH (32 bands x 4 rows) in the ingest index.
+# Candidates sharing a band are confirmed by estimated Jaccard similarity.
+NEAR_DUPLICATE_THRESHOLD = float(os.getenv("NEAR_DUPLICATE_THRESHOLD", 0.85))
+MINHASH_PERMUTATIONS = 128
+LSH_BANDS = 32
+LSH_ROWS = MINHASH_PERMUTATIONS // LSH_BANDS
+_MINHASH_PRIME = np.uint64((1 << 61) - 1)
+# Fixed seed: signatures must match across processes and restarts
+_minhash_rng = np.random.RandomState(20240101)
+_MINHASH_A = _minhash_rng.randint(1, 2**31 - 1, size=MINHASH_PERMUTATIONS).astype(np.uint64)
+_MINHASH_B = _minhash_rng.randint(0, 2**31 - 1, size=MINHASH_PERMUTATIONS).astype(np.uint64)
+
+# Corpus version: an opaque token the writer replaces after every change to
+# the collection. It lives in Chroma itself so every worker sees the same
+# value and can drop its caches when it changes. A random token (not a
+# counter) means concurrent bumps or a fresh store can never reuse a version
+# another corpus already had; only compare versions for equality.
+corpus_meta = chroma_client.get_or_create_collection(name="corpus_meta")
+CORPUS_VERSION_ID = "corpus_version"
+
+# Sync endpoints run concurrently in the threadpool. Every change to the
+# corpus (ingest, delete, version bump) is check-then-act, so the writer
+# serialises them. Reentrant: ingestion removes papers and bumps the version.
+_write_lock = threading.RLock()
+
+# Per-process cache of /stats, keyed by corpus version
+_stats_cache: Dict[str, Any] = {"version": None, "stats": None}
+
+# Corpus version the collection handles above were opened at. Scripts like
+# migrate_storage.py and snapshot.py --replace recreate collections (new
+# ids), so workers reopen their handles when the version moves.
+_collections_state: Dict[str, Any] = {"version": None}
+
+# Read-through mode: when none of the papers /assess finds mention the
+# substance, fetch and ingest papers from PubMed, then answer. PubMed searches
+# that return nothing are cached negatively (in the ingest index) for
+# NEGATIVE_CACHE_TTL.
+READ_THROUGH = os.getenv("READ_THROUGH", "false").lower() in ("1", "true", "yes")
+READ_THROUGH_MAX_RESULTS = int(os.getenv("READ_THROUGH_MAX_RESULTS", 20))
+NEGATIVE_CACHE_TTL = int(os.getenv("NEGATIVE_CACHE_TTL", 3600))
+LIFE_STAGE_QUERY_TERMS = {
+    "pregnant": "pregnancy effects",
+    "postpartum": "breastfeeding lactation effects",
+    "planning": "fertility reproductive effects"
+}
+# One PubMed fetch at a time; concurrent misses for the same query wait for
+# the first one instead of fetching again
+_pubmed_lock = threading.Lock()
+_read_through_lock = threading.Lock()
+_read_through_inflight: Dict[str, threading.Event] = {}
 
 # Pydantic models
 class LoadPapersRequest(BaseModel):
     query: str = Field(..., description="PubMed search query")
     max_results: int = Field(20, ge=1, le=100, description="Maximum number of papers to fetch")
+    life_stage: Optional[str] = Field(None, description="Life stage the papers are about (planning, pregnant, postpartum, general)")
 
 class LoadPapersResponse(BaseModel):
     papers_loaded: int
@@ -74,6 +269,7 @@ class AssessmentRequest(BaseModel):
     usage_frequency: str = Field(..., description="How often used (daily, weekly, etc.)")
     min_quality_score: int = Field(50, ge=0, le=100, description="Minimum quality score for papers")
     max_papers: int = Field(5, ge=1, le=20, description="Maximum number of papers to use")
+    life_stage: Optional[str] = Field(None, description="Life stage (planning, pregnant, postpartum, general)")
 
 class AssessmentResponse(BaseModel):
     risk_level: str
@@ -90,6 +286,391 @@ class DatabaseStats(BaseModel):
     quality_distribution: Dict[str, int]
 
 # Helper functions
+def require_writer():
+    """Reject ingestion on query-only workers"""
+    if SERVER_ROLE != "writer":
+        raise HTTPException(
+            status_code=403,
+            detail="This worker is read-only (SERVER_ROLE=reader) - send ingestion requests to the writer"
+        )
+
+def get_corpus_version() -> str:
+    """Current corpus version token shared by all workers"""
+    result = corpus_meta.get(ids=[CORPUS_VERSION_ID], include=["metadatas"])
+    if not result['ids']:
+        return "initial"
+    return str(result['metadatas'][0].get('version', "initial"))
+
+def refresh_collections() -> str:
+    """Current corpus version, reopening collection handles if it moved"""
+    global collections
+    version = get_corpus_version()
+    if _collections_state["version"] != version:
+        if _collections_state["version"] is not None:
+            collections = open_papers_collections()
+        _collections_state["version"] = version
+    return version
+
+def bump_corpus_version() -> str:
+    """Mark the corpus as changed with a new version token (writer only)"""
+    with _write_lock:
+        previous = get_corpus_version()
+        version = uuid.uuid4().hex
+        corpus_meta.upsert(
+            ids=[CORPUS_VERSION_ID],
+            embeddings=[[0.0]],
+            metadatas=[{"version": version, "updated_at": datetime.utcnow().isoformat()}]
+        )
+        # Our own handles are still valid if they were current before this write
+        if _collections_state["version"] == previous:
+            _collections_state["version"] = version
+        return version
+
+_ingest_index_local = threading.local()
+
+def init_ingest_index():
+    """Create the ingest index schema (once, at startup)"""
+    os.makedirs(os.path.dirname(os.path.abspath(INGEST_INDEX_PATH)), exist_ok=True)
+    conn = sqlite3.connect(INGEST_INDEX_PATH, timeout=30)
+    try:
+        with conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("CREATE TABLE IF NOT EXISTS minhash (pmid TEXT PRIMARY KEY, signature BLOB NOT NULL)")
+            conn.execute("CREATE TABLE IF NOT EXISTS lsh_buckets (band INTEGER NOT NULL, bucket BLOB NOT NULL, pmid TEXT NOT NULL)")
+            conn.execute("CREATE INDEX IF NOT EXISTS lsh_buckets_lookup ON lsh_buckets (band, bucket)")
+            conn.execute("CREATE INDEX IF NOT EXISTS lsh_buckets_pmid ON lsh_buckets (pmid)")
+            conn.execute("CREATE TABLE IF NOT EXISTS negative_cache (query TEXT PRIMARY KEY, expires_at REAL NOT NULL)")
+    finally:
+        conn.close()
+
+def ingest_index_connection() -> sqlite3.Connection:
+    """This thread's connection to the ingest index"""
+    conn = getattr(_ingest_index_local, "conn", None)
+    if conn is None:
+        conn = sqlite3.connect(INGEST_INDEX_PATH, timeout=30)
+        _ingest_index_local.conn = conn
+    return conn
+
+init_ingest_index()
+
+def minhash_signature(text: str) -> Optional[np.ndarray]:
+    """MinHash signature of an abstract (None if it has no words)"""
+    words = re.findall(r"\w+", text.lower())
+    if not words:
+        return None
+    shingles = {" ".join(words[i:i + 3]) for i in range(max(1, len(words) - 2))}
+    hashes = np.array([zlib.crc32(shingle.encode("utf-8")) for shingle in shingles], dtype=np.uint64)
+    return ((_MINHASH_A[:, None] * hashes[None, :] + _MINHASH_B[:, None]) % _MINHASH_PRIME).min(axis=1)
+
+def signature_similarity(a: np.ndarray, b: np.ndarray) -> float:
+    """Estimated Jaccard similarity of two signatures"""
+    return float(np.mean(a == b))
+
+def lsh_bucket_keys(signature: np.ndarray) -> List[tuple]:
+    """(band, bucket) keys of a signature"""
+    return [
+        (band, signature[band * LSH_ROWS:(band + 1) * LSH_ROWS].tobytes())
+        for band in range(LSH_BANDS)
+    ]
+
+def chroma_batch_size() -> int:
+    """Largest batch the Chroma client accepts"""
+    try:
+        return chroma_client.get_max_batch_size()
+    except Exception:
+        return 1000
+
+def store_abstracts(abstracts: Dict[str, str]):
+    """Save abstracts keyed by PMID, indexing them for near-duplicate lookup"""
+    if not abstracts:
+        return
+    pmids = list(abstracts)
+    batch_size = chroma_batch_size()
+    for start in range(0, len(pmids), batch_size):
+        batch = pmids[start:start + batch_size]
+        abstracts_collection.upsert(
+            ids=batch,
+            embeddings=[[0.0]] * len(batch),
+            metadatas=[
+                {"body": base64.b64encode(zlib.compress(abstracts[pmid].encode("utf-8"))).decode("ascii")}
+                for pmid in batch
+            ]
+        )
+    
+    conn = ingest_index_connection()
+    with conn:
+        conn.executemany("DELETE FROM minhash WHERE pmid = ?", [(pmid,) for pmid in pmids])
+        conn.executemany("DELETE FROM lsh_buckets WHERE pmid = ?", [(pmid,) for pmid in pmids])
+        for pmid, text in abstracts.items():
+            signature = minhash_signature(text)
+            if signature is None:
+                continue
+            conn.execute("INSERT INTO minhash (pmid, signature) VALUES (?, ?)", (pmid, signature.tobytes()))
+            conn.executemany(
+                "INSERT INTO lsh_buckets (band, bucket, pmid) VALUES (?, ?, ?)",
+                [(band, bucket, pmid) for band, bucket in lsh_bucket_keys(signature)]
+            )
+
+def find_near_duplicates(signature: np.ndarray) -> Dict[str, float]:
+    """Stored PMIDs whose abstracts are near-duplicates of the signature"""
+    conn = ingest_index_connection()
+    candidates = set()
+    for band, bucket in lsh_bucket_keys(signature):
+        rows = conn.execute(
+            "SELECT pmid FROM lsh_buckets WHERE band = ? AND bucket = ?", (band, bucket)
+        ).fetchall()
+        candidates.update(pmid for (pmid,) in rows)
+    
+    duplicates = {}
+    for pmid in candidates:
+        row = conn.execute("SELECT signature FROM minhash WHERE pmid = ?", (pmid,)).fetchone()
+        if row is None:
+            continue
+        similarity = signature_similarity(signature, np.frombuffer(row[0], dtype=np.uint64))
+        if similarity >= NEAR_DUPLICATE_THRESHOLD:
+            duplicates[pmid] = similarity
+    return duplicates
+
+def fetch_abstracts(pmids: List[str]) -> Dict[str, str]:
+    """Load abstracts for the given PMIDs (missing ones are left out)"""
+    pmids = list(dict.fromkeys(pmids))
+    abstracts = {}
+    batch_size = chroma_batch_size()
+    for start in range(0, len(pmids), batch_size):
+        found = abstracts_collection.get(ids=pmids[start:start + batch_size], include=["metadatas"])
+        for pmid, metadata in zip(found['ids'], found['metadatas']):
+            abstracts[pmid] = zlib.decompress(base64.b64decode(metadata['body'])).decode("utf-8")
+    return abstracts
+
+def delete_abstracts(pmids: List[str]):
+    """Remove abstracts for the given PMIDs"""
+    if not pmids:
+        return
+    abstracts_collection.delete(ids=list(pmids))
+    conn = ingest_index_connection()
+    with conn:
+        for table in ("minhash", "lsh_buckets"):
+            conn.executemany(f"DELETE FROM {table} WHERE pmid = ?", [(pmid,) for pmid in pmids])
+
+def clear_abstracts():
+    """Remove every stored abstract"""
+    while True:
+        stale = abstracts_collection.get(include=[], limit=1000)['ids']
+        if not stale:
+            break
+        abstracts_collection.delete(ids=stale)
+    conn = ingest_index_connection()
+    with conn:
+        for table in ("minhash", "lsh_buckets"):
+            conn.execute(f"DELETE FROM {table}")
+
+def get_stored_papers(ids: List[str], include: List[str]) -> Dict[str, list]:
+    """Look up papers by id across all partitions"""
+    found: Dict[str, list] = {"ids": [], **{field: [] for field in include}}
+    for papers_collection in collections.values():
+        result = papers_collection.get(ids=ids, include=include)
+        found["ids"].extend(result["ids"])
+        for field in include:
+            found[field].extend(result[field])
+    return found
+
+def read_all_papers(include: List[str], page_size: int = 1000) -> Dict[str, list]:
+    """Every stored paper across all partitions"""
+    found: Dict[str, list] = {"ids": [], **{field: [] for field in include}}
+    for papers_collection in collections.values():
+        offset = 0
+        while True:
+            page = papers_collection.get(include=include, limit=page_size, offset=offset)
+            if not page["ids"]:
+                break
+            found["ids"].extend(page["ids"])
+            for field in include:
+                found[field].extend(page[field])
+            offset += len(page["ids"])
+    return found
+
+def count_papers() -> int:
+    """Number of papers across all partitions"""
+    return sum(papers_collection.count() for papers_collection in collections.values())
+
+def write_papers(ids: List[str], metadatas: List[Dict[str, Any]], embeddings: List[Any], upsert: bool = False):
+    """Add papers to their partitions in batches"""
+    batch_size = chroma_batch_size()
+    
+    by_partition: Dict[str, List[int]] = {}
+    for i, metadata in enumerate(metadatas):
+        by_partition.setdefault(partition_key(metadata), []).append(i)
+    
+    for key, indices in by_partition.items():
+        write = collections[key].upsert if upsert else collections[key].add
+        for start in range(0, len(indices), batch_size):
+            batch = indices[start:start + batch_size]
+            write(
+                ids=[ids[i] for i in batch],
+                metadatas=[metadatas[i] for i in batch],
+                embeddings=[embeddings[i] for i in batch]
+            )
+
+def empty_papers_collections():
+    """Delete every paper but keep the collections (and their ids)"""
+    for papers_collection in collections.values():
+        while True:
+            stale = papers_collection.get(include=[], limit=1000)['ids']
+            if not stale:
+                break
+            papers_collection.delete(ids=stale)
+
+def remove_papers(pmids: List[str]):
+    """Delete papers from the collections and their abstracts"""
+    if not pmids:
+        return
+    for papers_collection in collections.values():
+        papers_collection.delete(ids=[paper_id(pmid) for pmid in pmids])
+    delete_abstracts(pmids)
+
+def paper_id(pmid: str) -> str:
+    """Collection id for a paper"""
+    return f"pmid_{pmid}"
+
+def build_paper_metadata(paper: Dict[str, Any], compound: Optional[str] = None, category: Optional[str] = None) -> Dict[str, Any]:
+    """Canonical compact metadata stored with every paper"""
+    metadata = {
+        "pmid": str(paper['pmid']),
+        "title": paper.get('title', 'No title'),
+        "journal": paper.get('journal', ''),
+        "year": str(paper.get('year', '')),
+        "quality_score": int(paper.get('quality_score', 0)),
+        "is_rct": bool(paper.get('is_rct', False)),
+        "is_clinical_trial": bool(paper.get('is_clinical_trial', False))
+    }
+    if compound:
+        metadata["compound"] = compound
+    if category:
+        metadata["category"] = category
+    return metadata
+
+def embedding_text(title: str, abstract: str) -> str:
+    """Text that gets embedded for a paper"""
+    return f"{title}\n\n{abstract}"
+
+def select_distinct_papers(papers: List[Dict[str, Any]]) -> tuple:
+    """Drop near-duplicates from a batch of new papers.
+    
+    Each paper is compared with the stored corpus and the papers accepted
+    before it. Returns (papers to add, stored PMIDs they supersede).
+    """
+    accepted: Dict[str, tuple] = {}
+    replaced: List[str] = []
+    for paper in papers:
+        signature = minhash_signature(paper.get('abstract', ''))
+        if signature is None:
+            accepted[paper['pmid']] = (paper, None)
+            continue
+        
+        stored_duplicates = [pmid for pmid in find_near_duplicates(signature) if pmid not in replaced]
+        batch_duplicates = [
+            pmid for pmid, (other, other_signature) in accepted.items()
+            if other_signature is not None and signature_similarity(signature, other_signature) >= NEAR_DUPLICATE_THRESHOLD
+        ]
+        if not stored_duplicates and not batch_duplicates:
+            accepted[paper['pmid']] = (paper, signature)
+            continue
+        
+        # Compare against the best existing version; ties keep what we have
+        scores = {pmid: accepted[pmid][0]['quality_score'] for pmid in batch_duplicates}
+        if stored_duplicates:
+            stored = get_stored_papers([paper_id(pmid) for pmid in stored_duplicates], ["metadatas"])
+            scores.update({m['pmid']: m['quality_score'] for m in stored['metadatas']})
+        if paper['quality_score'] > max(scores.values(), default=-1):
+            for pmid in batch_duplicates:
+                del accepted[pmid]
+            replaced.extend(pmid for pmid in stored_duplicates if pmid in scores)
+            accepted[paper['pmid']] = (paper, signature)
+    
+    return [paper for paper, _ in accepted.values()], replaced
+
+def ingest_papers(papers: List[Dict[str, Any]], compound: Optional[str] = None, category: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Store fetched papers that are not in the collection yet; returns the ones added"""
+    if not papers:
+        return []
+    
+    with _write_lock:
+        # Skip papers already stored (and repeats within this batch). Stores not
+        # yet migrated may hold them under the legacy PMID_<id> scheme.
+        pmids = [str(p['pmid']) for p in papers]
+        stored = get_stored_papers([paper_id(pmid) for pmid in pmids] + [f"PMID_{pmid}" for pmid in pmids], ["metadatas"])
+        existing = {str(m['pmid']) for m in stored['metadatas']}
+        candidates = []
+        for paper in papers:
+            pmid = str(paper['pmid'])
+            if pmid not in existing:
+                existing.add(pmid)
+                candidates.append(paper)
+        
+        # Keep the best version (by quality score) of each near-duplicate cluster
+        new_papers, replaced = select_distinct_papers(candidates)
+        if replaced:
+            print(f"Replacing {len(replaced)} near-duplicate paper(s) with better-scored versions: {', '.join(replaced)}")
+            remove_papers(replaced)
+        if not new_papers:
+            if replaced:
+                bump_corpus_version()
+            return []
+        
+        store_abstracts({p['pmid']: p.get('abstract', '') for p in new_papers})
+        write_papers(
+            ids=[paper_id(p['pmid']) for p in new_papers],
+            metadatas=[build_paper_metadata(p, compound, category) for p in new_papers],
+            embeddings=embedding_function([embedding_text(p['title'], p.get('abstract', '')) for p in new_papers])
+        )
+        bump_corpus_version()
+        return new_papers
+
+def format_paper_context(metadata: Dict[str, Any], abstract: str) -> str:
+    """Render one paper for the assessment prompt"""
+    study_type = 'Randomized Controlled Trial' if metadata.get('is_rct') else 'Clinical Trial' if metadata.get('is_clinical_trial') else 'Observational'
+    return f"""Title: {metadata['title']}
+Journal: {metadata['journal']} ({metadata['year']})
+Study Type: {study_type}
+Quality Score: {metadata['quality_score']}/100
+
+Abstract:
+{abstract or 'No abstract available'}"""
+
+def query_partitions(keys: List[str], query_embedding: Any, request: AssessmentRequest) -> List[tuple]:
+    """(distance, metadata) of the closest papers in the given partitions, best first"""
+    matches = []
+    for key in keys:
+        results = collections[key].query(
+            query_embeddings=[query_embedding],
+            n_results=request.max_papers,
+            where={"quality_score": {"$gte": request.min_quality_score}},
+            include=["metadatas", "distances"]
+        )
+        if results['ids'] and results['ids'][0]:
+            matches.extend(zip(results['distances'][0], results['metadatas'][0]))
+    matches.sort(key=lambda match: match[0])
+    return matches[:request.max_papers]
+
+def search_papers(query_text: str, request: AssessmentRequest) -> List[tuple]:
+    """(distance, metadata) of the closest papers, best first.
+    
+    The partitions relevant to the life stage are searched first. Papers are
+    not always stored under the life stage they are asked about (preloaded
+    compounds are tagged pregnancy or planning), so when those partitions
+    have fewer than max_papers matches the rest of the partitions fill the
+    remaining slots. The query is embedded once for all partitions.
+    """
+    query_embedding = embedding_function([query_text])[0]
+    routed = partitions_for_life_stage(request.life_stage)
+    matches = query_partitions(routed, query_embedding, request)
+    if len(matches) < request.max_papers:
+        others = [key for key in collections if key not in routed]
+        if others:
+            fallback = query_partitions(others, query_embedding, request)
+            matches.extend(fallback[:request.max_papers - len(matches)])
+    return matches
+
 def generate_basic_assessment(request: AssessmentRequest, metadatas: List[Dict]) -> str:
     """Generate basic assessment when AI is not available"""
     # Count clinical trials
@@ -185,26 +766,126 @@ def calculate_quality_score(paper: Dict[str, Any]) -> int:
     
     return min(score, 100)
 
+class EUtilsClient:
+    """Keep-alive client for NCBI E-utilities.
+    
+    Reuses pooled HTTPS connections, asks for gzip, POSTs long id lists,
+    stays under NCBI's request rate and retries transient failures with
+    jittered exponential backoff. Per-call timing and bytes are logged and
+    summed in `metrics`.
+    """
+    RETRY_STATUSES = (429, 500, 502, 503, 504)
+    # Longer id lists are POSTed (NCBI rejects very long URLs)
+    POST_ID_THRESHOLD = 200
+    
+    def __init__(self, email: str, api_key: Optional[str] = None, base_url: str = EUTILS_BASE_URL,
+                 max_retries: int = 4, backoff: float = 0.5, timeout: float = 30, pool_size: int = 10):
+        self.base_url = base_url.rstrip("/") + "/"
+        self.params = {"tool": "nestwell", "email": email}
+        if api_key:
+            self.params["api_key"] = api_key
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.timeout = timeout
+        # NCBI allows 3 requests/second without an API key, 10 with one
+        self.min_interval = 0.1 if api_key else 0.34
+        
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers["Accept-Encoding"] = "gzip, deflate"
+        
+        self._rate_lock = threading.Lock()
+        self._last_request = 0.0
+        self._metrics_lock = threading.Lock()
+        self.metrics = {"calls": 0, "retries": 0, "failures": 0, "seconds": 0.0, "bytes_received": 0, "bytes_decoded": 0}
+    
+    def _throttle(self):
+        """Wait until the next request is allowed"""
+        with self._rate_lock:
+            wait = self._last_request + self.min_interval - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+            self._last_request = time.monotonic()
+    
+    def _record(self, **counts):
+        with self._metrics_lock:
+            for key, value in counts.items():
+                self.metrics[key] += value
+    
+    def request(self, endpoint: str, params: Dict[str, Any]) -> bytes:
+        """Call an E-utility and return the (decompressed) response body"""
+        url = f"{self.base_url}{endpoint}.fcgi"
+        params = {**params, **self.params}
+        ids = params.get("id")
+        if isinstance(ids, (list, tuple)):
+            params["id"] = ",".join(ids)
+        use_post = isinstance(ids, (list, tuple)) and len(ids) > self.POST_ID_THRESHOLD
+        
+        for attempt in range(self.max_retries + 1):
+            self._throttle()
+            start = time.perf_counter()
+            try:
+                if use_post:
+                    response = self.session.post(url, data=params, timeout=self.timeout)
+                else:
+                    response = self.session.get(url, params=params, timeout=self.timeout)
+                if response.status_code not in self.RETRY_STATUSES:
+                    response.raise_for_status()
+                    body = response.content
+                    elapsed = time.perf_counter() - start
+                    received = response.raw.tell() or len(body)
+                    self._record(calls=1, seconds=elapsed, bytes_received=received, bytes_decoded=len(body))
+                    print(f"E-utilities {endpoint}: {elapsed * 1000:.0f} ms, {received} bytes "
+                          f"({len(body)} decoded, {response.headers.get('Content-Encoding', 'identity')})")
+                    return body
+                error = requests.HTTPError(f"{response.status_code} from {endpoint}", response=response)
+                retry_after = response.headers.get("Retry-After")
+            except (requests.ConnectionError, requests.Timeout,
+                    requests.exceptions.ChunkedEncodingError, requests.exceptions.ContentDecodingError) as e:
+                # Includes connections dropped mid-body and truncated gzip
+                error = e
+                retry_after = None
+            
+            if attempt == self.max_retries:
+                self._record(failures=1)
+                raise error
+            
+            # Full jitter; honour Retry-After on 429/503
+            delay = random.uniform(0, self.backoff * (2 ** attempt))
+            if retry_after and retry_after.isdigit():
+                delay = max(delay, float(retry_after))
+            print(f"E-utilities {endpoint} failed ({error}), retrying in {delay:.1f}s")
+            self._record(retries=1)
+            time.sleep(delay)
+    
+    def esearch(self, term: str, retmax: int, sort: str = "relevance") -> List[str]:
+        """PMIDs matching a PubMed query"""
+        body = self.request("esearch", {"db": "pubmed", "term": term, "retmax": retmax, "sort": sort})
+        return list(Entrez.read(io.BytesIO(body))["IdList"])
+    
+    def efetch(self, pmids: List[str]) -> List[Any]:
+        """Parsed PubmedArticle records for PMIDs"""
+        body = self.request("efetch", {"db": "pubmed", "id": list(pmids), "rettype": "xml", "retmode": "xml"})
+        return Entrez.read(io.BytesIO(body))["PubmedArticle"]
+
+eutils = EUtilsClient(email=NCBI_EMAIL, api_key=NCBI_API_KEY)
+
 def fetch_pubmed_papers(query: str, max_results: int) -> List[Dict[str, Any]]:
     """Fetch papers from PubMed"""
     try:
         # Search PubMed
-        search_handle = Entrez.esearch(db="pubmed", term=query, retmax=max_results, sort="relevance")
-        search_results = Entrez.read(search_handle)
-        search_handle.close()
-        
-        pmids = search_results["IdList"]
+        pmids = eutils.esearch(query, max_results)
         if not pmids:
             return []
         
         # Fetch detailed records
-        fetch_handle = Entrez.efetch(db="pubmed", id=pmids, rettype="xml", retmode="xml")
-        records = Entrez.read(fetch_handle)
-        fetch_handle.close()
+        records = eutils.efetch(pmids)
         
         # Parse records
         papers = []
-        for article in records["PubmedArticle"]:
+        for article in records:
             medline = article.get("MedlineCitation", {})
             article_data = medline.get("Article", {})
             
@@ -250,15 +931,82 @@ def fetch_pubmed_papers(query: str, max_results: int) -> List[Dict[str, Any]]:
             
             papers.append(paper)
         
-        # Rate limiting
-        time.sleep(1)
-        
         return papers
     
+    except requests.RequestException as e:
+        print(f"PubMed unavailable after retries: {e}")
+        raise HTTPException(status_code=502, detail=f"PubMed unavailable: {str(e)}")
     except Exception as e:
         print(f"Error fetching PubMed papers: {e}")
         raise HTTPException(status_code=500, detail=f"Error fetching papers: {str(e)}")
 
+def is_negatively_cached(query: str) -> bool:
+    """Whether a PubMed search recently returned nothing"""
+    row = ingest_index_connection().execute("SELECT expires_at FROM negative_cache WHERE query = ?", (query,)).fetchone()
+    return row is not None and row[0] > time.time()
+
+def cache_negative(query: str):
+    """Remember that a PubMed search returned nothing"""
+    conn = ingest_index_connection()
+    with conn:
+        conn.execute(
+            "INSERT OR REPLACE INTO negative_cache (query, expires_at) VALUES (?, ?)",
+            (query, time.time() + NEGATIVE_CACHE_TTL)
+        )
+        conn.execute("DELETE FROM negative_cache WHERE expires_at <= ?", (time.time(),))
+
+def clear_negative_cache():
+    """Forget every negatively cached search (the corpus was cleared or replaced)"""
+    conn = ingest_index_connection()
+    with conn:
+        conn.execute("DELETE FROM negative_cache")
+
+def mentions_substance(matches: List[tuple], substance: str) -> bool:
+    """Whether any matched paper names the substance in its title, compound or abstract"""
+    term = substance.strip().lower()
+    if not term:
+        return bool(matches)
+    
+    pmids = []
+    for _, metadata in matches:
+        if term in metadata.get('title', '').lower() or term in metadata.get('compound', '').lower():
+            return True
+        pmids.append(metadata['pmid'])
+    return any(term in abstract.lower() for abstract in fetch_abstracts(pmids).values())
+
+def build_pubmed_query(substance: str, product_type: str, life_stage: Optional[str]) -> str:
+    """PubMed query for a read-through miss"""
+    query = f"{substance} {product_type} toxicity"
+    terms = LIFE_STAGE_QUERY_TERMS.get((life_stage or "").lower())
+    return f"{query} {terms}" if terms else query
+
+def read_through_ingest(query: str, category: Optional[str]) -> int:
+    """Fetch and ingest papers for a search miss; returns the number added"""
+    if is_negatively_cached(query):
+        return 0
+    
+    with _read_through_lock:
+        inflight = _read_through_inflight.get(query)
+        if inflight is None:
+            _read_through_inflight[query] = threading.Event()
+    if inflight is not None:
+        # Another request is already fetching this query
+        inflight.wait(timeout=120)
+        return 0
+    
+    try:
+        with _pubmed_lock:
+            papers = fetch_pubmed_papers(query, READ_THROUGH_MAX_RESULTS)
+            if not papers:
+                # Only PubMed having nothing is cached: papers that were
+                # already stored or near-duplicates may be deleted later
+                cache_negative(query)
+                return 0
+            return len(ingest_papers(papers, category=category))
+    finally:
+        with _read_through_lock:
+            _read_through_inflight.pop(query).set()
+
 def get_quality_category(score: int) -> str:
     """Categorize quality score"""
     if score >= 80:
@@ -270,14 +1018,109 @@ def get_quality_category(score: int) -> str:
     else:
         return "low"
 
+def compute_stats(metadatas: List[Dict]) -> DatabaseStats:
+    """Aggregate statistics over paper metadata"""
+    quality_dist = {"high": 0, "good": 0, "moderate": 0, "low": 0}
+    if not metadatas:
+        return DatabaseStats(
+            total_papers=0,
+            average_quality_score=0,
+            clinical_trial_count=0,
+            quality_distribution=quality_dist
+        )
+    
+    quality_scores = [m['quality_score'] for m in metadatas]
+    avg_quality = sum(quality_scores) / len(quality_scores)
+    
+    clinical_trial_count = sum(1 for m in metadatas if m.get('is_clinical_trial', False))
+    
+    # Quality distribution
+    for score in quality_scores:
+        category = get_quality_category(score)
+        quality_dist[category] += 1
+    
+    return DatabaseStats(
+        total_papers=len(metadatas),
+        average_quality_score=round(avg_quality, 2),
+        clinical_trial_count=clinical_trial_count,
+        quality_distribution=quality_dist
+    )
+
+def configured_workers() -> int:
+    """Worker processes uvicorn was started with (--workers or WEB_CONCURRENCY)"""
+    for i, arg in enumerate(sys.argv):
+        if arg == "--workers" and i + 1 < len(sys.argv):
+            return int(sys.argv[i + 1])
+        if arg.startswith("--workers="):
+            return int(arg.split("=", 1)[1])
+    return int(os.getenv("WEB_CONCURRENCY", 1))
+
+@app.on_event("startup")
+def check_serving_mode():
+    """Refuse process layouts that break the single-writer model"""
+    workers = configured_workers()
+    if SERVER_ROLE == "writer" and workers > 1:
+        raise RuntimeError(
+            f"SERVER_ROLE=writer must run as a single worker (got {workers}) - "
+            "scale out with SERVER_ROLE=reader workers instead"
+        )
+    if not CHROMA_HOST and SERVER_ROLE == "reader":
+        raise RuntimeError("SERVER_ROLE=reader needs CHROMA_HOST - readers share the writer's data through a Chroma server")
+    if not CHROMA_HOST and workers > 1:
+        raise RuntimeError(f"The embedded ChromaDB store is single-process (got {workers} workers) - set CHROMA_HOST")
+
+@app.on_event("startup")
+def check_abstract_store():
+    """Warn when stored papers have no abstracts, still use the old layout,
+    or (on the writer) are missing from the near-duplicate index"""
+    sample = {}
+    for papers_collection in collections.values():
+        page = papers_collection.get(include=["metadatas", "documents"], limit=100)
+        sample.update(zip(page['ids'], zip(page['metadatas'], page['documents'])))
+    if not sample:
+        return
+    
+    if not fetch_abstracts([str(metadata['pmid']) for metadata, _ in sample.values()]):
+        print("Warning: papers are stored but the abstracts collection has none of their abstracts - "
+              "assessments will say 'No abstract available'. Run migrate_storage.py if the store predates it.")
+    if any(pid.startswith("PMID_") or document for pid, (_, document) in sample.items()):
+        print("Warning: the store uses the old layout (abstracts in Chroma documents) - run migrate_storage.py")
+    if SERVER_ROLE == "writer" and not ingest_index_connection().execute("SELECT 1 FROM minhash LIMIT 1").fetchone():
+        print(f"Warning: the near-duplicate index at {INGEST_INDEX_PATH} is empty, so ingestion cannot see "
+              "near-duplicates of stored papers - run dedup_corpus.py on this host to rebuild it")
+
+def not_modified(request: Request, response: Response, version: str) -> Optional[Response]:
+    """Set the ETag for a read endpoint; returns a 304 if the client has it.
+    
+    The ETag is the corpus version plus the server role, request path and
+    query, so it changes whenever the corpus does and writers and readers
+    behind one URL (GET / reports the role) never share one.
+    """
+    key = f"{app.version}:{SERVER_ROLE}:{request.url.path}?{request.url.query}"
+    etag = f'W/"{version}-{zlib.crc32(key.encode("utf-8")):08x}"'
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    response.headers.update(headers)
+    
+    if_none_match = request.headers.get("if-none-match", "")
+    if if_none_match.strip() == "*" or etag in [tag.strip() for tag in if_none_match.split(",")]:
+        return Response(status_code=304, headers=headers)
+    return None
+
 # API Endpoints
 @app.get("/")
-async def root():
+def root(request: Request, response: Response):
     """API root endpoint"""
+    version = refresh_collections()
+    cached = not_modified(request, response, version)
+    if cached:
+        return cached
+    
     return {
         "name": "Toxicity Assessment RAG System",
         "version": "1.0.0",
         "description": "RAG system for toxicity assessment using PubMed papers",
+        "role": SERVER_ROLE,
+        "corpus_version": version,
         "endpoints": {
             "POST /load-papers": "Load papers from PubMed",
             "POST /assess": "Get toxicity assessment",
@@ -288,9 +1131,12 @@ async def root():
     }
 
 @app.post("/load-papers", response_model=LoadPapersResponse)
-async def load_papers(request: LoadPapersRequest):
+def load_papers(request: LoadPapersRequest):
     """Load papers from PubMed into the database"""
+    require_writer()
     try:
+        refresh_collections()
+        
         # Fetch papers
         papers = fetch_pubmed_papers(request.query, request.max_results)
         
@@ -302,75 +1148,70 @@ async def load_papers(request: LoadPapersRequest):
                 message="No papers found for the query"
             )
         
-        # Prepare documents for ChromaDB
-        documents = []
-        metadatas = []
-        ids = []
+        # Store papers (compact metadata + abstracts collection); already stored
+        # papers and near-duplicates are skipped
+        added = ingest_papers(papers, category=LIFE_STAGE_CATEGORIES.get((request.life_stage or "").lower()))
         
-        for paper in papers:
-            doc_text = f"""Title: {paper['title']}
-Journal: {paper['journal']} ({paper['year']})
-Study Type: {'Randomized Controlled Trial' if paper['is_rct'] else 'Clinical Trial' if paper['is_clinical_trial'] else 'Observational'}
-Quality Score: {paper['quality_score']}/100
-
-Abstract:
-{paper['abstract']}"""
-            
-            documents.append(doc_text)
-            metadatas.append({
-                "pmid": paper['pmid'],
-                "quality_score": paper['quality_score'],
-                "year": paper['year'],
-                "is_rct": paper['is_rct'],
-                "is_clinical_trial": paper['is_clinical_trial'],
-                "journal": paper['journal'],
-                "title": paper['title']
-            })
-            ids.append(f"pmid_{paper['pmid']}")
-        
-        # Add to ChromaDB
-        collection.add(
-            documents=documents,
-            metadatas=metadatas,
-            ids=ids
-        )
+        if not added:
+            return LoadPapersResponse(
+                papers_loaded=0,
+                average_quality_score=0,
+                clinical_trial_count=0,
+                message="All papers found are already stored"
+            )
         
-        # Calculate statistics
-        avg_quality = sum(p['quality_score'] for p in papers) / len(papers)
-        clinical_trial_count = sum(1 for p in papers if p['is_clinical_trial'])
+        # Calculate statistics over the papers actually added
+        avg_quality = sum(p['quality_score'] for p in added) / len(added)
+        clinical_trial_count = sum(1 for p in added if p['is_clinical_trial'])
         
         return LoadPapersResponse(
-            papers_loaded=len(papers),
+            papers_loaded=len(added),
             average_quality_score=round(avg_quality, 2),
             clinical_trial_count=clinical_trial_count,
             message="Papers loaded successfully"
         )
     
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/assess", response_model=AssessmentResponse)
-async def assess(request: AssessmentRequest):
+def assess(request: AssessmentRequest):
     """Get toxicity assessment for a substance"""
     try:
+        refresh_collections()
+        
         # Query ChromaDB for relevant papers
         query_text = f"{request.substance} {request.product_type} toxicity"
         
-        results = collection.query(
-            query_texts=[query_text],
-            n_results=request.max_papers,
-            where={"quality_score": {"$gte": request.min_quality_score}}
-        )
+        matches = search_papers(query_text, request)
+        
+        # Read-through: the nearest papers are returned even for an unknown
+        # substance, so a miss is "none of them mention it". Fetch the missing
+        # evidence from PubMed and retry; answer 404 rather than from
+        # unrelated papers.
+        if READ_THROUGH and SERVER_ROLE == "writer" and not mentions_substance(matches, request.substance):
+            pubmed_query = build_pubmed_query(request.substance, request.product_type, request.life_stage)
+            read_through_ingest(pubmed_query, LIFE_STAGE_CATEGORIES.get((request.life_stage or "").lower()))
+            matches = search_papers(query_text, request)
+            if not mentions_substance(matches, request.substance):
+                matches = []
         
-        if not results['documents'] or not results['documents'][0]:
+        if not matches:
             raise HTTPException(
                 status_code=404,
                 detail=f"No papers found for '{request.substance}' with quality score >= {request.min_quality_score}"
             )
         
-        # Get papers
-        papers = results['documents'][0]
-        metadatas = results['metadatas'][0]
+        # Get papers, with full abstracts from the abstracts collection
+        metadatas = [metadata for _, metadata in matches[:request.max_papers]]
+        abstracts = fetch_abstracts([m['pmid'] for m in metadatas])
+        missing = [m['pmid'] for m in metadatas if m['pmid'] not in abstracts]
+        if missing:
+            print(f"Warning: no stored abstract for PMID(s) {', '.join(missing)} - "
+                  "run migrate_storage.py if the store predates the abstracts collection")
+        papers = [format_paper_context(m, abstracts.get(m['pmid'], '')) for m in metadatas]
         
         # Calculate average quality
         avg_quality = sum(m['quality_score'] for m in metadatas) / len(metadatas)
@@ -457,50 +1298,38 @@ Be concise and evidence-based. Start with the safety rating."""
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/stats", response_model=DatabaseStats)
-async def get_stats():
+def get_stats(request: Request, response: Response):
     """Get database statistics"""
     try:
-        # Get all papers
-        all_data = collection.get()
-        
-        if not all_data['ids']:
-            return DatabaseStats(
-                total_papers=0,
-                average_quality_score=0,
-                clinical_trial_count=0,
-                quality_distribution={"high": 0, "good": 0, "moderate": 0, "low": 0}
-            )
-        
-        # Calculate statistics
-        metadatas = all_data['metadatas']
-        total_papers = len(metadatas)
+        # Nothing to send if the client's copy is current
+        version = refresh_collections()
+        cached = not_modified(request, response, version)
+        if cached:
+            return cached
         
-        quality_scores = [m['quality_score'] for m in metadatas]
-        avg_quality = sum(quality_scores) / len(quality_scores) if quality_scores else 0
+        # Serve from cache while the corpus is unchanged
+        if _stats_cache["version"] == version:
+            return _stats_cache["stats"]
         
-        clinical_trial_count = sum(1 for m in metadatas if m.get('is_clinical_trial', False))
-        
-        # Quality distribution
-        quality_dist = {"high": 0, "good": 0, "moderate": 0, "low": 0}
-        for score in quality_scores:
-            category = get_quality_category(score)
-            quality_dist[category] += 1
-        
-        return DatabaseStats(
-            total_papers=total_papers,
-            average_quality_score=round(avg_quality, 2),
-            clinical_trial_count=clinical_trial_count,
-            quality_distribution=quality_dist
-        )
+        # Get all papers
+        all_data = read_all_papers(["metadatas"])
+        stats = compute_stats(all_data['metadatas'] or [])
+        _stats_cache["version"] = version
+        _stats_cache["stats"] = stats
+        return stats
     
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/papers")
-async def get_papers(limit: int = 50):
+def get_papers(request: Request, response: Response, limit: int = 50):
     """List papers in database"""
     try:
-        all_data = collection.get()
+        cached = not_modified(request, response, refresh_collections())
+        if cached:
+            return cached
+        
+        all_data = read_all_papers(["metadatas"])
         
         if not all_data['ids']:
             return {"papers": [], "total": 0}
@@ -526,15 +1355,17 @@ async def get_papers(limit: int = 50):
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.delete("/papers")
-async def clear_papers():
+def clear_papers():
     """Clear the entire database"""
+    require_writer()
     try:
-        # Delete and recreate collection
-        chroma_client.delete_collection(name="toxicity_papers")
-        collection = chroma_client.create_collection(
-            name="toxicity_papers",
-            metadata={"hnsw:space": "cosine"}
-        )
+        # Empty the collections in place so other workers' handles stay valid
+        with _write_lock:
+            refresh_collections()
+            empty_papers_collections()
+            clear_abstracts()
+            clear_negative_cache()
+            bump_corpus_version()
         
         return {"message": "Database cleared successfully"}
     
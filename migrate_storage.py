@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Convert an existing ChromaDB store to the compact storage layout.
+
+Older stores keep the abstract twice (as the Chroma document and, for
+preloaded papers, as an `abstract` metadata field) and use two id schemes
+(`pmid_<id>` and `PMID_<id>`). This script moves every abstract into the
+abstracts collection, rewrites metadata to the canonical schema and drops the
+Chroma documents. Existing embeddings are kept, so nothing is re-embedded.
+
+It also rebuilds the collections with the current HNSW settings and
+COLLECTION_PARTITIONING mode, so run it again after changing either.
+
+Records are written to new staging collections first; the old collections
+are only dropped once every record has been written, and the staging
+collections then take their names. If a run is interrupted, leftover
+staging collections are picked up again by the next run.
+
+Usage:
+    python migrate_storage.py
+"""
+
+import os
+import re
+import sys
+import uuid
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+# Import from main.py
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import main
+from main import (
+    chroma_client,
+    COLLECTION_NAME,
+    HNSW_SETTINGS,
+    partition_names,
+    write_papers,
+    build_paper_metadata,
+    paper_id,
+    fetch_abstracts,
+    store_abstracts,
+    bump_corpus_version
+)
+
+PAGE_SIZE = 1000
+
+# Staging collections are named migrating_<run id>_<final name>
+STAGING_PATTERN = re.compile(r"^migrating_[0-9a-f]{8}_")
+
+def source_collections():
+    """Every papers collection in the store, from either partitioning mode.
+
+    Staging collections left behind by an interrupted run come last, so
+    records in the live collections win when both have a PMID.
+    """
+    live, staged = [], []
+    for entry in chroma_client.list_collections():
+        name = getattr(entry, "name", entry)
+        base = STAGING_PATTERN.sub("", name)
+        if base == COLLECTION_NAME or base.startswith(f"{COLLECTION_NAME}_"):
+            source = chroma_client.get_collection(name=name, embedding_function=main.embedding_function)
+            (live if base == name else staged).append(source)
+    return live + staged
+
+def open_staging_collections():
+    """Create empty collections to migrate into, keyed like main.collections."""
+    run_id = uuid.uuid4().hex[:8]
+    return {
+        key: chroma_client.create_collection(
+            name=f"migrating_{run_id}_{name}",
+            metadata=dict(HNSW_SETTINGS),
+            embedding_function=main.embedding_function
+        )
+        for key, name in partition_names().items()
+    }
+
+def extract_abstract(document, metadata):
+    """Recover the abstract from an old-style record (None if it has none)."""
+    if metadata.get('abstract'):
+        return metadata['abstract']
+    if not document:
+        return None
+    # Documents written by /load-papers repeat title, journal and score first
+    marker = "\nAbstract:\n"
+    if marker in document:
+        return document.split(marker, 1)[1]
+    return document
+
+def main_cli():
+    """Migrate every stored record."""
+    print("\n" + "="*60)
+    print("STORAGE MIGRATION")
+    print("="*60)
+
+    # Read everything first; records are rewritten below
+    sources = source_collections()
+    old_ids, documents, metadatas, embeddings = [], [], [], []
+    for source in sources:
+        offset = 0
+        while True:
+            page = source.get(
+                include=["documents", "metadatas", "embeddings"],
+                limit=PAGE_SIZE,
+                offset=offset
+            )
+            if not page['ids']:
+                break
+            old_ids.extend(page['ids'])
+            documents.extend(page['documents'])
+            metadatas.extend(page['metadatas'])
+            embeddings.extend(page['embeddings'])
+            offset += len(page['ids'])
+
+    if not old_ids:
+        print("Database is empty, nothing to migrate")
+        return
+
+    # One record per PMID in the canonical layout; records already migrated
+    # keep the abstract that is in the store
+    stored = fetch_abstracts([str(m['pmid']) for m in metadatas])
+    new_records = {}
+    abstracts = {}
+    for document, metadata, embedding in zip(documents, metadatas, embeddings):
+        pmid = str(metadata['pmid'])
+        if paper_id(pmid) in new_records:
+            continue
+        abstract = extract_abstract(document, metadata)
+        if abstract is None and pmid not in stored:
+            abstract = ''
+        if abstract is not None:
+            abstracts[pmid] = abstract
+        new_records[paper_id(pmid)] = (
+            build_paper_metadata(metadata, metadata.get('compound'), metadata.get('category')),
+            embedding
+        )
+
+    store_abstracts(abstracts)
+
+    # Write into fresh collections so old metadata keys and documents are
+    # really gone and the current HNSW settings apply. The sources stay
+    # untouched until every record is written.
+    live = main.collections
+    main.collections = open_staging_collections()
+    ids = list(new_records)
+    try:
+        write_papers(
+            ids=ids,
+            metadatas=[new_records[i][0] for i in ids],
+            embeddings=[new_records[i][1] for i in ids]
+        )
+    except Exception:
+        for staged in main.collections.values():
+            chroma_client.delete_collection(name=staged.name)
+        main.collections = live
+        raise
+
+    # Swap: drop the sources, then give the staging collections their names
+    for source in sources:
+        chroma_client.delete_collection(name=source.name)
+    for key, name in partition_names().items():
+        main.collections[key].modify(name=name)
+
+    print(f"Records read: {len(old_ids)}")
+    print(f"Records written: {len(ids)} ({len(old_ids) - len(ids)} duplicate ids merged)")
+    print(f"Near-duplicate index: {main.INGEST_INDEX_PATH}")
+    print(f"Corpus version: {bump_corpus_version()}")
+    print("\n✅ Migration complete!")
+
+if __name__ == "__main__":
+    main_cli()
@@ -16,8 +16,10 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from main import (
     fetch_pubmed_papers, 
     calculate_quality_score,
-    collection,
-    chroma_client
+    chroma_client,
+    eutils,
+    count_papers,
+    ingest_papers
 )
 
 # Toxic compounds for pregnant women
@@ -79,51 +81,19 @@ def load_papers_for_compound(compound_name, search_query, max_results, descripti
             print(f"❌ No papers found for {compound_name}")
             return 0
         
-        # Store papers in ChromaDB
-        added_count = 0
+        # Store papers in ChromaDB (existing papers and near-duplicates are skipped)
+        category = 'pregnancy' if compound_name in PREGNANCY_COMPOUNDS else 'planning'
+        added = ingest_papers(papers, compound=compound_name, category=category)
+        added_pmids = {paper['pmid'] for paper in added}
+        
         for paper in papers:
-            try:
-                # Check if paper already exists
-                results = collection.get(
-                    where={"pmid": paper['pmid']},
-                    limit=1
-                )
-                
-                if results['ids']:
-                    print(f"⏭️  Paper {paper['pmid']} already exists, skipping")
-                    continue
-                
-                # Quality score is already calculated in paper dict
-                quality_score = paper.get('quality_score', 0)
-                
-                # Create metadata
-                metadata = {
-                    'pmid': paper['pmid'],
-                    'title': paper['title'],
-                    'journal': paper.get('journal', 'Unknown'),
-                    'year': paper.get('year', 'Unknown'),
-                    'quality_score': quality_score,
-                    'is_clinical_trial': paper.get('is_clinical_trial', False),
-                    'abstract': paper.get('abstract', 'No abstract available'),
-                    'compound': compound_name,
-                    'category': 'pregnancy' if compound_name in PREGNANCY_COMPOUNDS else 'planning'
-                }
-                
-                # Add to ChromaDB
-                collection.add(
-                    documents=[paper.get('abstract', 'No abstract available')],
-                    metadatas=[metadata],
-                    ids=[f"PMID_{paper['pmid']}"]
-                )
-                
-                added_count += 1
-                print(f"✅ Added paper {paper['pmid']}: {paper['title'][:70]}...")
-                print(f"   Quality score: {quality_score}/100")
-                
-            except Exception as e:
-                print(f"⚠️  Error adding paper {paper.get('pmid', 'unknown')}: {e}")
+            if paper['pmid'] not in added_pmids:
+                print(f"⏭️  Paper {paper['pmid']} already exists or is a near-duplicate, skipping")
                 continue
+            print(f"✅ Added paper {paper['pmid']}: {paper['title'][:70]}...")
+            print(f"   Quality score: {paper.get('quality_score', 0)}/100")
         
+        added_count = len(added)
         print(f"\n✅ Successfully added {added_count} papers for {compound_name}")
         return added_count
         
@@ -172,11 +142,14 @@ def main():
     print("="*60)
     print(f"Total papers added: {total_added}")
     print(f"Compounds loaded: {len(PREGNANCY_COMPOUNDS) + len(PLANNING_COMPOUNDS)}")
+    metrics = eutils.metrics
+    print(f"PubMed calls: {metrics['calls']} ({metrics['retries']} retries, {metrics['failures']} failed)")
+    print(f"PubMed time: {metrics['seconds']:.1f}s, {metrics['bytes_received'] / 1024:.0f} KB received")
     print("="*60)
     
     # Get stats
     try:
-        stats = collection.count()
+        stats = count_papers()
         print(f"\nTotal papers in database: {stats}")
     except Exception as e:
         print(f"Could not get database stats: {e}")
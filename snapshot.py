@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Export and import prebuilt corpus snapshots.
+
+A snapshot holds everything needed to restore the collection without
+PubMed or re-embedding: ids, embeddings, metadata, abstracts and the
+aggregate stats at export time, in one compressed, checksummed file. The
+checksum covers the header too, and the header names the embedding
+function, so vectors from another model are refused on import.
+
+Usage:
+    python snapshot.py export corpus.snapshot
+    python snapshot.py import corpus.snapshot [--if-empty] [--replace]
+"""
+
+import os
+import sys
+import json
+import zlib
+import base64
+import hashlib
+import argparse
+from datetime import datetime
+
+import numpy as np
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+# Import from main.py
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import main
+from main import (
+    compute_stats,
+    fetch_abstracts,
+    store_abstracts,
+    clear_abstracts,
+    clear_negative_cache,
+    read_all_papers,
+    write_papers,
+    count_papers,
+    open_papers_collections,
+    get_corpus_version,
+    bump_corpus_version
+)
+
+SNAPSHOT_MAGIC = b"NESTWELL-SNAPSHOT\n"
+SNAPSHOT_FORMAT_VERSION = 3
+IMPORT_CHUNK = 1000
+
+def embedding_function_name() -> str:
+    """Name of the embedding function the stored vectors come from."""
+    function = main.embedding_function
+    return function.name() if hasattr(function, "name") else type(function).__name__
+
+def snapshot_digest(header: dict, compressed: bytes) -> str:
+    """SHA-256 over the header (minus the digest itself) and the payload."""
+    fields = {key: value for key, value in header.items() if key != "sha256"}
+    digest = hashlib.sha256(json.dumps(fields, sort_keys=True).encode("utf-8"))
+    digest.update(compressed)
+    return digest.hexdigest()
+
+def export_snapshot(path: str) -> dict:
+    """Write the whole collection to a snapshot file and return its header."""
+    papers = read_all_papers(["metadatas", "embeddings"])
+    ids, metadatas, embeddings = papers['ids'], papers['metadatas'], papers['embeddings']
+
+    stored = fetch_abstracts([m['pmid'] for m in metadatas])
+    abstracts = [stored.get(m['pmid'], '') for m in metadatas]
+    matrix = np.asarray(embeddings, dtype="<f4")
+    dim = int(matrix.shape[1]) if len(ids) else 0
+
+    payload = json.dumps({
+        "ids": ids,
+        "metadatas": metadatas,
+        "abstracts": abstracts,
+        "embeddings": base64.b64encode(matrix.tobytes()).decode("ascii")
+    }, separators=(",", ":")).encode("utf-8")
+    compressed = zlib.compress(payload, 9)
+
+    header = {
+        "format_version": SNAPSHOT_FORMAT_VERSION,
+        "created_at": datetime.utcnow().isoformat(),
+        "partitioning": main.COLLECTION_PARTITIONING,
+        "corpus_version": get_corpus_version(),
+        "count": len(ids),
+        "embedding_dim": dim,
+        "embedding_function": embedding_function_name(),
+        "stats": compute_stats(metadatas).model_dump(),
+        "payload_bytes": len(compressed)
+    }
+    header["sha256"] = snapshot_digest(header, compressed)
+
+    with open(path, "wb") as f:
+        f.write(SNAPSHOT_MAGIC)
+        f.write(json.dumps(header).encode("utf-8") + b"\n")
+        f.write(compressed)
+
+    return header
+
+def read_snapshot(path: str):
+    """Read and verify a snapshot file, returning (header, payload)."""
+    with open(path, "rb") as f:
+        if f.readline() != SNAPSHOT_MAGIC:
+            raise ValueError(f"{path} is not a NestWell snapshot")
+        header = json.loads(f.readline())
+        compressed = f.read()
+
+    if header.get("format_version") != SNAPSHOT_FORMAT_VERSION:
+        raise ValueError(f"Unsupported snapshot format version: {header.get('format_version')}")
+    if snapshot_digest(header, compressed) != header.get("sha256"):
+        raise ValueError("Snapshot checksum mismatch - file is corrupt, truncated or its header was edited")
+
+    payload = json.loads(zlib.decompress(compressed))
+    count, dim = header["count"], header["embedding_dim"]
+    matrix = np.frombuffer(base64.b64decode(payload["embeddings"]), dtype="<f4")
+    lengths = {len(payload[field]) for field in ("ids", "metadatas", "abstracts")}
+    if lengths != {count} or matrix.size != count * dim:
+        raise ValueError(
+            f"Snapshot header says {count} papers x {dim} dimensions, but the payload has "
+            f"{len(payload['ids'])} ids, {len(payload['metadatas'])} metadatas, "
+            f"{len(payload['abstracts'])} abstracts and {matrix.size} embedding values"
+        )
+    payload["embeddings"] = matrix.reshape(count, dim)
+    return header, payload
+
+def import_snapshot(path: str, replace: bool = False) -> dict:
+    """Bulk-load a snapshot into the collection without re-embedding."""
+    header, payload = read_snapshot(path)
+    if header["embedding_function"] != embedding_function_name():
+        raise ValueError(
+            f"Snapshot embeddings come from '{header['embedding_function']}', but this server embeds "
+            f"queries with '{embedding_function_name()}' - their vectors are not comparable"
+        )
+
+    if replace:
+        main.collections = open_papers_collections(reset=True)
+        clear_abstracts()
+        clear_negative_cache()
+
+    # Papers are routed to partitions by their metadata, so a snapshot
+    # loads into either partitioning mode
+    ids = payload["ids"]
+    metadatas = payload["metadatas"]
+    for start in range(0, len(ids), IMPORT_CHUNK):
+        end = start + IMPORT_CHUNK
+        store_abstracts({m['pmid']: a for m, a in zip(metadatas[start:end], payload["abstracts"][start:end])})
+        write_papers(
+            ids=ids[start:end],
+            metadatas=metadatas[start:end],
+            embeddings=payload["embeddings"][start:end],
+            upsert=True
+        )
+
+    bump_corpus_version()
+    return header
+
+def main_cli():
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Export or import a corpus snapshot")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    export_parser = subparsers.add_parser("export", help="Write the collection to a snapshot file")
+    export_parser.add_argument("path")
+
+    import_parser = subparsers.add_parser("import", help="Load a snapshot file into the collection")
+    import_parser.add_argument("path")
+    import_parser.add_argument("--if-empty", action="store_true", help="Skip if the collection already has papers")
+    import_parser.add_argument("--replace", action="store_true", help="Clear the collection before importing")
+
+    args = parser.parse_args()
+
+    if args.command == "export":
+        header = export_snapshot(args.path)
+        print(f"✅ Exported {header['count']} papers to {args.path} ({header['payload_bytes']} bytes)")
+        print(f"   sha256: {header['sha256']}")
+        return
+
+    if args.if_empty and count_papers() > 0:
+        print(f"⏭️  Database already has {count_papers()} papers, skipping import")
+        return
+
+    header = import_snapshot(args.path, replace=args.replace)
+    print(f"✅ Imported {header['count']} papers from {args.path} (exported {header['created_at']})")
+    print(f"   Corpus version: {get_corpus_version()}")
+
+if __name__ == "__main__":
+    main_cli()
@@ -73,6 +73,19 @@ def test_get_papers():
     assert "papers" in data
     print(f"✅ Retrieved {len(data['papers'])} papers")
 
+def test_conditional_get():
+    """Test ETag / If-None-Match on read endpoints"""
+    for path in ["/", "/stats", "/papers?limit=5"]:
+        response = requests.get(f"{BASE_URL}{path}")
+        assert response.status_code == 200
+        etag = response.headers.get("ETag")
+        assert etag
+        
+        cached = requests.get(f"{BASE_URL}{path}", headers={"If-None-Match": etag})
+        assert cached.status_code == 304
+        assert cached.headers.get("ETag") == etag
+    print("✅ Conditional GET working")
+
 if __name__ == "__main__":
     print("Running API tests...")
     print("Make sure server is running: uvicorn main:app --reload")
@@ -83,6 +96,7 @@ if __name__ == "__main__":
     test_stats()
     test_assess()
     test_get_papers()
+    test_conditional_get()
     
     print("-" * 50)
     print("✅ All tests passed!")
@@ -0,0 +1,79 @@
+"""
+Near-duplicate handling tests (no server or network needed)
+Run with: pytest test_dedup.py -v
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+import dedup_corpus
+
+BASE = [f"word{i}" for i in range(200)]
+
+def abstract(variant=0):
+    """An abstract; different variants are near-duplicates of each other"""
+    return " ".join(BASE[:-1] + [f"ending{variant}"])
+
+def paper(pmid, quality_score, text):
+    return {"pmid": pmid, "title": f"Paper {pmid}", "abstract": text,
+            "journal": "Toxicology", "year": "2020", "quality_score": quality_score}
+
+def test_keeps_best_within_batch(store):
+    """Only the best-scored version of a same-batch cluster is accepted"""
+    batch = [paper("1", 50, abstract(1)), paper("2", 70, abstract(2)), paper("3", 60, abstract(3)),
+             paper("4", 40, "an unrelated abstract about parabens and endocrine effects in adults")]
+
+    accepted, replaced = store.select_distinct_papers(batch)
+
+    assert sorted(p["pmid"] for p in accepted) == ["2", "4"]
+    assert replaced == []
+
+def test_better_paper_replaces_stored(store, add_stored_papers):
+    """A better-scored new version supersedes the stored one"""
+    add_stored_papers([paper("10", 60, abstract(10))])
+
+    accepted, replaced = store.select_distinct_papers([paper("11", 40, abstract(11)), paper("12", 80, abstract(12))])
+
+    assert [p["pmid"] for p in accepted] == ["12"]
+    assert replaced == ["10"]
+
+def test_stored_paper_kept_when_better(store, add_stored_papers):
+    """New versions that score no higher than the stored one are dropped"""
+    add_stored_papers([paper("20", 90, abstract(20))])
+
+    accepted, replaced = store.select_distinct_papers([paper("21", 90, abstract(21)), paper("22", 50, abstract(22))])
+
+    assert accepted == []
+    assert replaced == []
+
+def test_clusters_do_not_chain(store):
+    """b is close to a and c, but c is not close to a, so c survives"""
+    a = np.arange(128, dtype=np.uint64)
+    b = a.copy()
+    b[:16] += 1000
+    c = b.copy()
+    c[16:32] += 1000
+    signatures = {"a": a, "b": b, "c": c}
+
+    assert dedup_corpus.find_clusters(signatures, ["a", "b", "c"]) == [["a", "b"]]
+    assert dedup_corpus.find_clusters(signatures, ["b", "a", "c"]) == [["b", "a", "c"]]
+
+def test_concurrent_ingest_adds_each_paper_once(store, embeddings):
+    """Parallel /load-papers calls for the same papers only add them once"""
+    batch = [paper(str(100 + i), 60, f"study {i} " + " ".join(f"topic{i}_{j}" for j in range(30))) for i in range(20)]
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        added = list(pool.map(lambda _: store.ingest_papers(batch), range(4)))
+
+    assert sum(len(papers) for papers in added) == 20
+    assert store.count_papers() == 20
+
+def test_concurrent_near_duplicates_keep_one(store, embeddings):
+    """Near-duplicates ingested in parallel still end up as one paper"""
+    versions = [[paper(str(200 + i), 50 + i, abstract(i))] for i in range(4)]
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        list(pool.map(store.ingest_papers, versions))
+
+    assert [m["pmid"] for m in store.read_all_papers(["metadatas"])["metadatas"]] == ["203"]
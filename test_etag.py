@@ -0,0 +1,52 @@
+"""
+Conditional GET tests for the read endpoints (no server or network needed)
+Run with: pytest test_etag.py -v
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+
+def paper(pmid):
+    return {"pmid": pmid, "title": f"Paper {pmid}", "abstract": f"retinol study {pmid}",
+            "journal": "Toxicology", "year": "2021", "quality_score": 60}
+
+@pytest.fixture
+def client(store):
+    return TestClient(store.app)
+
+def test_unchanged_corpus_returns_304(client):
+    first = client.get("/stats")
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+
+    second = client.get("/stats", headers={"If-None-Match": etag})
+
+    assert second.status_code == 304
+    assert second.headers["ETag"] == etag
+    assert second.content == b""
+
+def test_write_changes_etag(store, client, embeddings):
+    """After papers are added the old ETag no longer matches"""
+    etag = client.get("/stats").headers["ETag"]
+
+    store.ingest_papers([paper("1"), paper("2")])
+    response = client.get("/stats", headers={"If-None-Match": etag})
+
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert response.json()["total_papers"] == 2
+
+def test_clearing_papers_changes_etag(store, client, add_stored_papers):
+    add_stored_papers([paper("1")])
+    store.bump_corpus_version()
+    etag = client.get("/papers").headers["ETag"]
+
+    assert client.delete("/papers").status_code == 200
+    response = client.get("/papers", headers={"If-None-Match": etag})
+
+    assert response.status_code == 200
+    assert response.json()["total"] == 0
+
+def test_etag_depends_on_query(client):
+    """Different pages of /papers never share an ETag"""
+    assert client.get("/papers?limit=5").headers["ETag"] != client.get("/papers?limit=10").headers["ETag"]
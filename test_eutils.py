@@ -0,0 +1,98 @@
+"""
+E-utilities client retry tests (no network needed)
+Run with: pytest test_eutils.py -v
+"""
+
+import pytest
+import requests
+
+import main
+
+class StubRaw:
+    def tell(self):
+        return 0
+
+class StubResponse:
+    def __init__(self, status_code=200, body=b"ok", headers=None, error=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.raw = StubRaw()
+        self._body = body
+        self._error = error
+
+    @property
+    def content(self):
+        if self._error:
+            raise self._error
+        return self._body
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code}", response=self)
+
+class StubSession:
+    """Hands out the queued responses in order and counts requests"""
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.calls = 0
+
+    def get(self, url, params=None, timeout=None):
+        self.calls += 1
+        return self.responses.pop(0)
+
+    post = get
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Record backoff delays instead of sleeping; jitter is always 0"""
+    delays = []
+    monkeypatch.setattr(main.time, "sleep", delays.append)
+    monkeypatch.setattr(main.random, "uniform", lambda low, high: 0.0)
+    return delays
+
+def make_client(responses, max_retries=3):
+    client = main.EUtilsClient(email="test@example.com", max_retries=max_retries)
+    client.min_interval = 0
+    client.session = StubSession(responses)
+    return client
+
+@pytest.mark.parametrize("status", [503, 429])
+def test_retries_transient_status(sleeps, status):
+    """429/503 are retried until a good response arrives"""
+    client = make_client([StubResponse(status), StubResponse(status), StubResponse(body=b"<ok/>")])
+
+    assert client.request("esearch", {"term": "retinol"}) == b"<ok/>"
+    assert client.session.calls == 3
+    assert len(sleeps) == 2
+    assert client.metrics["retries"] == 2
+    assert client.metrics["calls"] == 1
+
+def test_honours_retry_after(sleeps):
+    """The backoff waits at least as long as Retry-After asks"""
+    client = make_client([StubResponse(429, headers={"Retry-After": "7"}), StubResponse()])
+
+    client.request("esearch", {"term": "retinol"})
+
+    assert sleeps == [7.0]
+
+def test_gives_up_after_max_retries(sleeps):
+    """After max_retries retries the last error is raised"""
+    client = make_client([StubResponse(503) for _ in range(5)], max_retries=2)
+
+    with pytest.raises(requests.HTTPError, match="503"):
+        client.request("efetch", {"id": ["1", "2"]})
+
+    assert client.session.calls == 3
+    assert len(sleeps) == 2
+    assert client.metrics["failures"] == 1
+
+def test_retries_truncated_body(sleeps):
+    """A body cut off mid-transfer is retried like a dropped connection"""
+    client = make_client([
+        StubResponse(error=requests.exceptions.ChunkedEncodingError("connection broken")),
+        StubResponse(error=requests.exceptions.ContentDecodingError("bad gzip")),
+        StubResponse(body=b"<ok/>")
+    ])
+
+    assert client.request("efetch", {"id": ["1"]}) == b"<ok/>"
+    assert client.session.calls == 3
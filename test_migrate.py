@@ -0,0 +1,76 @@
+"""
+Storage migration tests (no server or network needed)
+Run with: pytest test_migrate.py -v
+"""
+
+import pytest
+
+import migrate_storage
+from conftest import EMBEDDING_DIM
+
+RETINOL = "Retinol exposure in early pregnancy and congenital malformations."
+PARABENS = "Paraben exposure and endocrine effects in women of reproductive age."
+
+@pytest.fixture
+def legacy_store(store):
+    """A pre-migration store: abstracts in documents and metadata, two id schemes"""
+    store.collections["all"].add(
+        ids=["pmid_301", "PMID_302", "PMID_301"],
+        documents=[
+            f"Title: Retinol study\nJournal: Toxicology\nQuality Score: 70/100\nAbstract:\n{RETINOL}",
+            PARABENS,
+            RETINOL
+        ],
+        metadatas=[
+            {"pmid": "301", "title": "Retinol study", "journal": "Toxicology", "year": "2020",
+             "quality_score": 70, "is_clinical_trial": False, "category": "pregnancy"},
+            {"pmid": "302", "title": "Paraben study", "journal": "Lancet", "year": 2019, "quality_score": 55,
+             "is_clinical_trial": True, "abstract": PARABENS, "compound": "parabens", "source": "preload"},
+            {"pmid": "301", "title": "Retinol study", "journal": "Toxicology", "year": "2020",
+             "quality_score": 70, "abstract": RETINOL}
+        ],
+        embeddings=[[1.0] * EMBEDDING_DIM, [2.0] * EMBEDDING_DIM, [1.0] * EMBEDDING_DIM]
+    )
+    return store
+
+def collection_names(store):
+    return sorted(getattr(entry, "name", entry) for entry in store.chroma_client.list_collections())
+
+def test_legacy_store_round_trip(legacy_store):
+    """Legacy records come out compact, with abstracts in the abstracts collection"""
+    store = legacy_store
+    migrate_storage.main_cli()
+    store.refresh_collections()
+
+    papers = store.read_all_papers(["metadatas", "documents", "embeddings"])
+    assert sorted(papers["ids"]) == ["pmid_301", "pmid_302"]
+    assert papers["documents"] == [None, None]
+    by_id = dict(zip(papers["ids"], zip(papers["metadatas"], papers["embeddings"])))
+    assert by_id["pmid_302"][0] == {
+        "pmid": "302", "title": "Paraben study", "journal": "Lancet", "year": "2019",
+        "quality_score": 55, "is_rct": False, "is_clinical_trial": True, "compound": "parabens"
+    }
+    assert by_id["pmid_301"][0]["category"] == "pregnancy"
+    assert list(by_id["pmid_302"][1]) == pytest.approx([2.0] * EMBEDDING_DIM)
+    assert store.fetch_abstracts(["301", "302"]) == {"301": RETINOL, "302": PARABENS}
+    assert not [name for name in collection_names(store) if name.startswith("migrating_")]
+
+    # Running it again on the compact store keeps the abstracts
+    migrate_storage.main_cli()
+    store.refresh_collections()
+    assert store.count_papers() == 2
+    assert store.fetch_abstracts(["301", "302"]) == {"301": RETINOL, "302": PARABENS}
+
+def test_failed_write_keeps_sources(legacy_store, monkeypatch):
+    """If writing the new records fails, the legacy records are untouched"""
+    store = legacy_store
+    def fail(**kwargs):
+        raise RuntimeError("disk full")
+    monkeypatch.setattr(migrate_storage, "write_papers", fail)
+
+    with pytest.raises(RuntimeError):
+        migrate_storage.main_cli()
+    store.refresh_collections()
+
+    assert sorted(store.read_all_papers([])["ids"]) == ["PMID_301", "PMID_302", "pmid_301"]
+    assert not [name for name in collection_names(store) if name.startswith("migrating_")]
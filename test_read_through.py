@@ -0,0 +1,117 @@
+"""
+Read-through mode tests (no server or network needed)
+Run with: pytest test_read_through.py -v
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from fastapi.testclient import TestClient
+
+QUERY = "retinol cream toxicity pregnancy effects"
+
+def paper(pmid, text):
+    return {"pmid": pmid, "title": f"Paper {pmid}", "abstract": text,
+            "journal": "Toxicology", "year": "2021", "quality_score": 60}
+
+class StubPubMed:
+    """Stands in for fetch_pubmed_papers and records every search"""
+    def __init__(self):
+        self.papers = []
+        self.queries = []
+
+    def __call__(self, query, max_results=10):
+        self.queries.append(query)
+        return list(self.papers)
+
+@pytest.fixture
+def pubmed(store, embeddings, monkeypatch):
+    stub = StubPubMed()
+    monkeypatch.setattr(store, "fetch_pubmed_papers", stub)
+    monkeypatch.setattr(store, "READ_THROUGH", True)
+    monkeypatch.setattr(store, "GEMINI_AVAILABLE", False)
+    return stub
+
+def assess(store, substance):
+    return TestClient(store.app).post("/assess", json={
+        "substance": substance, "product_type": "cream", "usage_frequency": "daily",
+        "life_stage": "pregnant", "min_quality_score": 50
+    })
+
+def test_miss_fetches_and_answers(store, pubmed):
+    """An empty store is filled from PubMed and the request answered from it"""
+    pubmed.papers = [paper("1", "retinol cream exposure and birth defects")]
+
+    response = assess(store, "retinol")
+
+    assert response.status_code == 200
+    assert [source["pmid"] for source in response.json()["sources"]] == ["1"]
+    assert pubmed.queries == [QUERY]
+
+def test_unrelated_papers_are_a_miss(store, pubmed, add_stored_papers):
+    """Stored papers about other substances do not answer for an unknown one"""
+    add_stored_papers([paper("1", "retinol cream exposure and birth defects")])
+
+    response = assess(store, "bakuchiol")
+
+    assert response.status_code == 404
+    assert pubmed.queries == ["bakuchiol cream toxicity pregnancy effects"]
+
+def test_relevant_papers_are_not_fetched_again(store, pubmed, add_stored_papers):
+    """A substance named only in a stored abstract still counts as a hit"""
+    add_stored_papers([paper("1", "retinol cream exposure and birth defects")])
+
+    assert assess(store, "Retinol").status_code == 200
+    assert pubmed.queries == []
+
+def test_cached_miss_skips_pubmed(store, pubmed):
+    assert assess(store, "bakuchiol").status_code == 404
+    assert assess(store, "bakuchiol").status_code == 404
+
+    assert len(pubmed.queries) == 1
+
+def test_empty_search_is_cached(store, pubmed):
+    """A PubMed search that returns nothing is not repeated"""
+    assert store.read_through_ingest(QUERY, "pregnancy") == 0
+    assert store.read_through_ingest(QUERY, "pregnancy") == 0
+
+    assert pubmed.queries == [QUERY]
+
+def test_search_of_stored_papers_is_not_cached(store, pubmed):
+    """Results that were already stored add nothing, but are not a negative result"""
+    pubmed.papers = [paper("1", "retinol cream exposure and birth defects")]
+    assert store.read_through_ingest(QUERY, "pregnancy") == 1
+    assert store.read_through_ingest(QUERY, "pregnancy") == 0
+
+    assert not store.is_negatively_cached(QUERY)
+    assert len(pubmed.queries) == 2
+
+def test_clearing_papers_clears_cache(store, pubmed):
+    store.read_through_ingest(QUERY, "pregnancy")
+    assert store.is_negatively_cached(QUERY)
+
+    assert TestClient(store.app).delete("/papers").status_code == 200
+
+    assert not store.is_negatively_cached(QUERY)
+
+def test_concurrent_misses_fetch_once(store, pubmed, monkeypatch):
+    """Requests that miss on the same query while it is being fetched wait for that fetch"""
+    release = threading.Event()
+    def slow_fetch(query, max_results=10):
+        release.wait(timeout=10)
+        return pubmed(query, max_results)
+    monkeypatch.setattr(store, "fetch_pubmed_papers", slow_fetch)
+    pubmed.papers = [paper("1", "retinol cream exposure and birth defects")]
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        results = [pool.submit(store.read_through_ingest, QUERY, "pregnancy") for _ in range(4)]
+        while QUERY not in store._read_through_inflight:
+            time.sleep(0.01)
+        time.sleep(0.2)
+        release.set()
+        added = [r.result() for r in results]
+
+    assert pubmed.queries == [QUERY]
+    assert sorted(added) == [0, 0, 0, 1]
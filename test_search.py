@@ -0,0 +1,94 @@
+"""
+Search routing and index settings tests (no server or network needed)
+Run with: pytest test_search.py -v
+"""
+
+import pytest
+
+from conftest import HashingEmbeddings
+
+def paper(pmid, category, text, quality_score=60):
+    return {"pmid": pmid, "title": f"Paper {pmid}", "abstract": text, "journal": "Toxicology",
+            "year": "2021", "quality_score": quality_score, "category": category}
+
+def request(store, life_stage, max_papers=3, substance="retinol"):
+    return store.AssessmentRequest(substance=substance, product_type="cream", usage_frequency="daily",
+                                   life_stage=life_stage, max_papers=max_papers, min_quality_score=50)
+
+class CountingEmbeddings(HashingEmbeddings):
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, input):
+        self.calls += 1
+        return super().__call__(input)
+
+@pytest.fixture
+def partitioned(store, monkeypatch):
+    """main.py in COLLECTION_PARTITIONING=category mode, with empty partitions"""
+    monkeypatch.setattr(store, "COLLECTION_PARTITIONING", "category")
+    monkeypatch.setattr(store, "collections", store.open_papers_collections())
+    monkeypatch.setattr(store, "embedding_function", CountingEmbeddings())
+    store.empty_papers_collections()
+    yield store
+    for papers_collection in store.collections.values():
+        store.chroma_client.delete_collection(name=papers_collection.name)
+
+def test_routed_categories():
+    import main
+    assert main.routed_categories("pregnant") == ["pregnancy", "general"]
+    assert main.routed_categories("Postpartum") == ["postpartum", "general"]
+    assert main.routed_categories("general") == main.PARTITION_CATEGORIES
+    assert main.routed_categories(None) == main.PARTITION_CATEGORIES
+    assert main.routed_categories("unknown") == main.PARTITION_CATEGORIES
+
+def test_unpartitioned_searches_everything(store):
+    assert store.partitions_for_life_stage("pregnant") == ["all"]
+
+def test_routed_partitions_answer_first(partitioned, add_stored_papers):
+    """When the routed partitions have enough matches, other partitions are not used"""
+    add_stored_papers([
+        paper("1", "pregnancy", "retinol cream toxicity in pregnancy"),
+        paper("2", "general", "retinol toxicity review"),
+        paper("3", "planning", "retinol cream toxicity retinol cream toxicity")
+    ])
+
+    matches = partitioned.search_papers("retinol cream toxicity", request(partitioned, "pregnant", max_papers=2))
+
+    assert sorted(m["pmid"] for _, m in matches) == ["1", "2"]
+
+def test_fallback_fills_remaining_slots(partitioned, add_stored_papers):
+    """Preloaded papers are only tagged pregnancy/planning; postpartum still finds them"""
+    add_stored_papers([
+        paper("1", "general", "retinol use while breastfeeding"),
+        paper("2", "pregnancy", "retinol cream toxicity in pregnancy"),
+        paper("3", "planning", "retinol and fertility")
+    ])
+
+    matches = partitioned.search_papers("retinol cream toxicity", request(partitioned, "postpartum", max_papers=3))
+
+    pmids = [m["pmid"] for _, m in matches]
+    assert pmids[0] == "1"
+    assert sorted(pmids[1:]) == ["2", "3"]
+    distances = [distance for distance, _ in matches[1:]]
+    assert distances == sorted(distances)
+
+def test_query_is_embedded_once(partitioned, add_stored_papers):
+    """All partitions, fallback included, share one query embedding"""
+    add_stored_papers([paper("1", "pregnancy", "retinol cream toxicity")])
+
+    partitioned.search_papers("retinol cream toxicity", request(partitioned, "postpartum", max_papers=5))
+
+    assert partitioned.embedding_function.calls == 1
+
+def test_search_ef_applies_to_existing_collections(store, monkeypatch, capsys):
+    """A new HNSW_SEARCH_EF reaches the live collection; build-time changes are warned about"""
+    monkeypatch.setitem(store.HNSW_SETTINGS, "hnsw:search_ef", 77)
+    monkeypatch.setitem(store.HNSW_SETTINGS, "hnsw:M", 48)
+
+    store.open_papers_collections()
+
+    live = store.chroma_client.get_collection(store.COLLECTION_NAME).configuration["hnsw"]
+    assert live["ef_search"] == 77
+    assert live["max_neighbors"] != 48
+    assert "HNSW_M=48 only applies to new collections" in capsys.readouterr().out
@@ -0,0 +1,108 @@
+"""
+Snapshot export/import tests (no server or network needed)
+Run with: pytest test_snapshot.py -v
+"""
+
+import json
+
+import pytest
+
+import snapshot
+from conftest import HashingEmbeddings
+
+PAPERS = [
+    {"pmid": "101", "title": "Retinol in pregnancy", "abstract": "Retinol exposure and birth defects.",
+     "journal": "Toxicology", "year": "2021", "quality_score": 75, "is_clinical_trial": True},
+    {"pmid": "102", "title": "Parabens and hormones", "abstract": "Paraben exposure and endocrine effects.",
+     "journal": "Lancet", "year": "2018", "quality_score": 55}
+]
+
+def rewrite(path, mutate):
+    """Rewrite a snapshot file's header and payload with mutate(header, payload)"""
+    with open(path, "rb") as f:
+        magic, header, payload = f.readline(), json.loads(f.readline()), f.read()
+    header, payload = mutate(header, payload)
+    with open(path, "wb") as f:
+        f.write(magic + json.dumps(header).encode("utf-8") + b"\n" + payload)
+
+def test_round_trip(store, add_stored_papers, tmp_path):
+    """Exported papers come back with the same ids, metadata, embeddings and abstracts"""
+    add_stored_papers(PAPERS)
+    before = store.read_all_papers(["metadatas", "embeddings"])
+    path = str(tmp_path / "corpus.snapshot")
+
+    header = snapshot.export_snapshot(path)
+    assert header["count"] == 2
+    assert header["stats"]["total_papers"] == 2
+
+    store.empty_papers_collections()
+    store.clear_abstracts()
+    version = store.get_corpus_version()
+
+    snapshot.import_snapshot(path)
+    after = store.read_all_papers(["metadatas", "embeddings"])
+    assert sorted(after["ids"]) == sorted(before["ids"])
+    by_id = dict(zip(after["ids"], zip(after["metadatas"], after["embeddings"])))
+    for paper_id, metadata, embedding in zip(before["ids"], before["metadatas"], before["embeddings"]):
+        assert by_id[paper_id][0] == metadata
+        assert list(by_id[paper_id][1]) == pytest.approx(list(embedding))
+    assert store.fetch_abstracts(["101", "102"]) == {p["pmid"]: p["abstract"] for p in PAPERS}
+    assert store.get_corpus_version() != version
+
+def test_rejects_checksum_mismatch(store, add_stored_papers, tmp_path):
+    """A corrupted payload is refused before anything is written"""
+    add_stored_papers(PAPERS)
+    path = str(tmp_path / "corpus.snapshot")
+    snapshot.export_snapshot(path)
+    rewrite(path, lambda header, payload: (header, payload[:-1] + bytes([payload[-1] ^ 0xFF])))
+
+    with pytest.raises(ValueError, match="checksum"):
+        snapshot.import_snapshot(path)
+
+def test_rejects_format_version(store, add_stored_papers, tmp_path):
+    """Snapshots from another format version are refused"""
+    add_stored_papers(PAPERS)
+    path = str(tmp_path / "corpus.snapshot")
+    snapshot.export_snapshot(path)
+    rewrite(path, lambda header, payload: ({**header, "format_version": 1}, payload))
+
+    with pytest.raises(ValueError, match="format version"):
+        snapshot.import_snapshot(path)
+
+def test_rejects_edited_header(store, add_stored_papers, tmp_path):
+    """The checksum covers the header, not just the payload"""
+    add_stored_papers(PAPERS)
+    path = str(tmp_path / "corpus.snapshot")
+    snapshot.export_snapshot(path)
+    rewrite(path, lambda header, payload: ({**header, "count": 3}, payload))
+
+    with pytest.raises(ValueError, match="checksum"):
+        snapshot.import_snapshot(path)
+
+def test_rejects_count_mismatch(store, add_stored_papers, tmp_path):
+    """A header that disagrees with its payload is refused with a clear error"""
+    add_stored_papers(PAPERS)
+    path = str(tmp_path / "corpus.snapshot")
+    snapshot.export_snapshot(path)
+
+    def resign(header, payload):
+        header = {**header, "count": 3}
+        header["sha256"] = snapshot.snapshot_digest(header, payload)
+        return header, payload
+    rewrite(path, resign)
+
+    with pytest.raises(ValueError, match="header says 3 papers"):
+        snapshot.import_snapshot(path)
+    assert store.count_papers() == 2
+
+def test_rejects_other_embedding_function(store, add_stored_papers, tmp_path, monkeypatch):
+    """Vectors from another embedding model are not imported"""
+    add_stored_papers(PAPERS)
+    path = str(tmp_path / "corpus.snapshot")
+    snapshot.export_snapshot(path)
+    store.empty_papers_collections()
+    monkeypatch.setattr(store, "embedding_function", HashingEmbeddings())
+
+    with pytest.raises(ValueError, match="not comparable"):
+        snapshot.import_snapshot(path)
+    assert store.count_papers() == 0